@@ -1,93 +1,333 @@
-import random
-import logging
+import os
+import time
+
+# Startup is timed from here, see ThreeCardPokerGame.startup_times
+STARTED = time.perf_counter()
+
 from PyQt5.QtWidgets import QApplication, QMainWindow, QLabel, QPushButton, QVBoxLayout, QHBoxLayout, QGridLayout, \
-    QWidget, QInputDialog, QMessageBox, QFrame
-from PyQt5.QtGui import QFont, QPixmap, QPalette, QBrush
-from PyQt5.QtCore import Qt, QSize
+    QWidget, QInputDialog, QMessageBox, QFrame, QShortcut, QFileDialog
+from PyQt5.QtGui import QFont, QPixmap, QPalette, QBrush, QKeySequence
+from PyQt5.QtCore import Qt, QSize, QTimer, QObject, QThread, pyqtSignal, pyqtSlot
+
+import autoplay
+import game_state
+import hand_table
+import image_cache
+import metrics
+import poker_engine
+import profiles
+import round_log
+import session_stats
+import shoe
+
+
+class GameWorker(QObject):
+    # Runs the game state machine, round logging and shoe preparation for the window.
+    # It lives on its own thread; the window sends it requests and only sees the
+    # RoundState snapshots it emits.
+    dealt = pyqtSignal(object)
+    settled = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    # Fast auto play: the latest round and the rounds played so far, then the reason it stopped
+    auto_progressed = pyqtSignal(object, int)
+    auto_stopped = pyqtSignal(object, int, str)
+    # A copy of the session stats after rounds were recorded
+    stats_updated = pyqtSignal(object)
+    # Auto play runs in chunks of this long, between them the thread takes other requests
+    AUTO_CHUNK_SECONDS = 0.02
+
+    def __init__(self, machine, log_path, history_path):
+        super().__init__()
+        self.machine = machine
+        # The round log and hand history are opened once the window is up, not at startup
+        self.log_path = log_path
+        self.history_path = history_path
+        self.round_log = None
+        self.hand_history = None
+        self.stats = session_stats.SessionStats()
+        self.auto_source = None
+        self.auto_state = None
+        self.auto_rounds = 0
+
+    @pyqtSlot(int, int)
+    def place_bet(self, ante_bet, pair_plus_bet):
+        self.deal(lambda: self.machine.place_bet(ante_bet, pair_plus_bet))
+
+    @pyqtSlot()
+    def rebet(self):
+        self.deal(self.machine.rebet)
+
+    @pyqtSlot()
+    def play(self):
+        self.settle(self.machine.play)
+
+    @pyqtSlot()
+    def fold(self):
+        self.settle(self.machine.fold)
+
+    def deal(self, action):
+        try:
+            state = action()
+        except ValueError as e:
+            self.failed.emit(str(e))
+            return
+        self.dealt.emit(state)
+
+    def settle(self, action):
+        # Settle, log the round and get the shoe ready before the window hears about it
+        try:
+            state = action()
+        except ValueError as e:
+            self.failed.emit(str(e))
+            return
+        self.record(state)
+        self.flush_history()
+        self.machine.next_round()
+        self.settled.emit(state)
+        self.stats_updated.emit(self.stats.copy())
+
+    def record(self, state):
+        # Count the round in the session stats and queue one record for it, written to
+        # the log by a background thread
+        self.stats.add_state(state)
+        if self.round_log is None:
+            self.open_logs()
+        ante_winnings, pair_plus_winnings, play_winnings = state.winnings
+        self.round_log.log({
+            'round': state.round,
+            'player': [f"{card['rank']}{card['suit']}" for card in state.player_hand],
+            'dealer': [f"{card['rank']}{card['suit']}" for card in state.dealer_hand],
+            'result': state.result,
+            'dealer_qualified': state.dealer_qualified,
+            'ante': state.ante_bet,
+            'pair_plus': state.pair_plus_bet,
+            'play': state.play_bet,
+            'ante_win': ante_winnings,
+            'pair_plus_win': pair_plus_winnings,
+            'play_win': play_winnings,
+            'profited': state.profited,
+            'balance': state.balance,
+        })
+        if self.hand_history is not None:
+            self.hand_history.append(
+                hand_table.encode_hand(state.player_hand), hand_table.encode_hand(state.dealer_hand),
+                state.result, state.dealer_qualified, state.ante_bet, state.pair_plus_bet, state.play_bet,
+                state.profited, state.balance)
+
+    @pyqtSlot(object)
+    def start_auto(self, source):
+        # Play rounds from an autoplay source until it runs out, pauses or is stopped
+        self.auto_source = source
+        self.auto_state = None
+        self.auto_rounds = 0
+        self.run_auto()
+
+    @pyqtSlot()
+    def stop_auto(self):
+        if self.auto_source is not None:
+            self.finish_auto("Stopped")
+
+    def run_auto(self):
+        # One chunk of rounds, live ones are logged and the machine moved on like settle()
+        source = self.auto_source
+        if source is None:
+            return
+        deadline = time.perf_counter() + self.AUTO_CHUNK_SECONDS
+        while True:
+            try:
+                state = source.next_round()
+            except ValueError as e:
+                self.finish_auto(str(e))
+                return
+            if state is None:
+                self.finish_auto("Finished")
+                return
+            if source.live:
+                self.record(state)
+                self.machine.next_round()
+            self.auto_state = state
+            self.auto_rounds += 1
+            reason = autoplay.pause_reason(state)
+            if reason is not None:
+                self.finish_auto(reason)
+                return
+            if time.perf_counter() >= deadline:
+                break
+        self.auto_progressed.emit(state, self.auto_rounds)
+        if source.live:
+            self.flush_history()
+            self.stats_updated.emit(self.stats.copy())
+        QTimer.singleShot(0, self.run_auto)
+
+    def finish_auto(self, reason):
+        live = self.auto_source.live
+        self.auto_source = None
+        self.auto_stopped.emit(self.auto_state, self.auto_rounds, reason)
+        if live:
+            self.flush_history()
+            self.stats_updated.emit(self.stats.copy())
+
+    def flush_history(self):
+        # Write the hand history out after each played round or auto play chunk, so a crash
+        # loses at most one chunk (the round log's thread flushes each of its batches)
+        if self.hand_history is not None:
+            self.hand_history.flush()
+
+    @pyqtSlot()
+    def open_logs(self):
+        if self.round_log is not None:
+            return
+        self.round_log = round_log.RoundLogger(self.log_path)
+        if self.history_path:
+            import hand_history  # brings in NumPy when it is installed, so not at startup
+            self.hand_history = hand_history.HandHistoryWriter(self.history_path)
+
+    def close(self):
+        # Write out the rest of the round log and hand history
+        self.auto_source = None
+        if self.round_log is not None:
+            self.round_log.close()
+        if self.hand_history is not None:
+            self.hand_history.close()
+
+
+class ProfiledThread(QThread):
+    # A worker thread whose event loop runs under cProfile, saved to path when it stops.
+    # The profiler is enabled inside run() because each slot called on a plain QThread
+    # gets a fresh Python thread state that a profiler set from a slot wouldn't outlive.
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.path = path
+
+    def run(self):
+        profiler = metrics.start_profile()
+        try:
+            self.exec_()
+        finally:
+            metrics.stop_profile(profiler, self.path)
 
 
 class ThreeCardPokerGame(QMainWindow):
-    suits = ['♥️', '♦️', '♣️', '♠️']
-    ranks = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+    suits = poker_engine.SUITS
+    ranks = poker_engine.RANKS
     # Mapping of card suits for folders finding
-    suit_to_folder = {
-        '♥️': 'hearts',
-        '♦️': 'diamonds',
-        '♣️': 'clubs',
-        '♠️': 'spades'
-    }
-
-    def __init__(self):
+    suit_to_folder = poker_engine.SUIT_TO_FOLDER
+    # Pause before an auto play/fold decision so the dealt cards can be seen
+    AUTO_PLAY_DELAY_MS = 600
+    # Card images are scaled once to these sizes and cached
+    CARD_IMAGE_SIZE = QSize(100, 150)
+    CARD_BACK_SIZE = QSize(110, 150)
+    CARD_BACK_PATH = "imagaes/cards/card_back/card-backs-grid-red-clipart-xl.png"
+    # The background is drawn unscaled, a window around its starting size only shows this much of it
+    BACKGROUND_PATH = "imagaes/UI/1.png"
+    BACKGROUND_SIZE = QSize(800, 1080)
+    # Methods timed when THREE_CARD_METRICS is set
+    TIMED_METHODS = ['place_bet', 'quick_bet', 'play', 'fold', 'deal_hand', 'set_card_images', 'load_pixmap',
+                     'finish_game', 'show_round']
+    TIMED_WORKER_METHODS = ['deal', 'settle', 'record']
+    METRICS_REFRESH_MS = 500
+    # Fast auto play and replay redraw the latest round at most this often (about 30 times a second)
+    AUTO_REFRESH_MS = 33
+
+    # Requests to the GameWorker
+    bet_requested = pyqtSignal(int, int)
+    rebet_requested = pyqtSignal()
+    play_requested = pyqtSignal()
+    fold_requested = pyqtSignal()
+    auto_requested = pyqtSignal(object)
+    auto_stop_requested = pyqtSignal()
+    logs_requested = pyqtSignal()
+    # Emitted once the window has been painted for the first time
+    first_painted = pyqtSignal()
+
+    def __init__(self, threaded=True):
         super().__init__()
-        self.player_balance = 1000
+        # Milliseconds from STARTED to each step of startup, first_paint is added by paintEvent
+        self.startup_times = {'imports': (time.perf_counter() - STARTED) * 1000}
+        # Opt-in timing of the hot paths, THREE_CARD_METRICS=file to dump the timings to.
+        # F3 shows them over the window and F4 writes the file.
+        self.metrics_path = os.environ.get('THREE_CARD_METRICS') or None
+        self.metrics = metrics.Metrics() if self.metrics_path else None
+        if self.metrics is not None:
+            self.metrics.instrument(self, self.TIMED_METHODS)
+
+        # Dealing mode, THREE_CARD_SHOE='shoe:6' or 'csm:4' for more decks (see shoe.py), and
+        # rules, THREE_CARD_RULES=a profile name or .json file (see profiles.py)
+        machine = game_state.GameStateMachine(balance=1000, shoe=shoe.from_spec(os.environ.get('THREE_CARD_SHOE')),
+                                              rules=profiles.get(os.environ.get('THREE_CARD_RULES') or None))
+        self.round_state = machine.snapshot()
+        self.player_balance = self.round_state.balance
         self.player_hand = []
         self.dealer_hand = []
-        self.deck = self.shuffled_deck()
         self.ante_bet = 0
         self.pair_plus_bet = 0
         self.play_bet = 0
         self.profited = 0
-        self.game_round = 1
         self.payout_details = ""
-        self.last_ante_bet = 0
-        self.last_pair_plus_bet = 0
-
-        # Logger setup
-        self.logger = logging.getLogger('ThreeCardPokerGame')
-        self.logger.setLevel(logging.INFO)
-        file_handler = logging.FileHandler('game.log')
-        self.logger.addHandler(file_handler)
+        self.strategy = None
+        # Exact Play/Fold values of each dealt hand, toggled with F7 (see equity.py)
+        self.show_hints = False
+        self.pixmap_cache = {}
+        self.last_render_ms = 0.0
+        # Fast auto play and replay: the round waiting to be drawn, and the replay being played
+        self.auto_live = True
+        self.auto_state = None
+        self.auto_rounds = 0
+        self.auto_started = 0.0
+        self.replay = None
+
+        # Round log, THREE_CARD_LOG='' turns logging off, and binary hand history,
+        # THREE_CARD_HISTORY='' turns it off
+        log_path = os.environ.get('THREE_CARD_LOG', 'game.jsonl') or None
+        history_path = os.environ.get('THREE_CARD_HISTORY', 'game.hist')
+
+        # Game logic runs in a worker, on its own thread unless threaded is False
+        self.worker = GameWorker(machine, log_path, history_path)
+        if self.metrics is not None:
+            self.metrics.instrument(self.worker, self.TIMED_WORKER_METHODS, 'worker.')
+        self.worker_thread = None
+        if threaded:
+            # THREE_CARD_PROFILE=file profiles the window's thread to file (see __main__) and
+            # the worker's to file.worker
+            profile_path = os.environ.get('THREE_CARD_PROFILE')
+            if profile_path:
+                self.worker_thread = ProfiledThread(metrics.thread_profile_path(profile_path, 'worker'), self)
+            else:
+                self.worker_thread = QThread(self)
+            self.worker.moveToThread(self.worker_thread)
+            self.worker_thread.start()
+        self.bet_requested.connect(self.worker.place_bet)
+        self.rebet_requested.connect(self.worker.rebet)
+        self.play_requested.connect(self.worker.play)
+        self.fold_requested.connect(self.worker.fold)
+        self.worker.dealt.connect(self.deal_hand)
+        self.worker.settled.connect(self.finish_game)
+        self.worker.failed.connect(self.show_error)
+        self.auto_requested.connect(self.worker.start_auto)
+        self.auto_stop_requested.connect(self.worker.stop_auto)
+        # Opening the logs imports NumPy for the hand history, which the worker does after
+        # the first paint so that neither startup nor the first round waits for it
+        self.logs_requested.connect(self.worker.open_logs)
+        self.first_painted.connect(lambda: QTimer.singleShot(0, self.logs_requested.emit))
+        self.worker.auto_progressed.connect(self.auto_progressed)
+        self.worker.auto_stopped.connect(self.auto_stopped)
+        self.auto_refresh = QTimer(self)
+        self.auto_refresh.timeout.connect(self.refresh_auto)
+        self.session_stats = session_stats.SessionStats()
+        self.worker.stats_updated.connect(self.update_stats)
 
         # UI Initialization
         self.initUI()
         self.quick_bet_btn.setVisible(False)
+        QTimer.singleShot(0, self.preload_card_images)
+        if self.metrics is not None:
+            self.init_metrics_overlay()
+        self.init_stats_panel()
+        QShortcut(QKeySequence(Qt.Key_F7), self, self.toggle_hints)
 
-        # Payout for 'Play' bet
-        self.play_payout = {
-            "High Card": 1,
-            "Pair": 1,
-            "Flush": 1,
-            "Straight": 1,
-            "Three of a Kind": 1,
-            "Straight Flush": 1
-        }
-
-        # Payout for 'Ante' bet
-        self.ante_payout = {
-            "High Card": 1,
-            "Pair": 1,
-            "Flush": 1,
-            "Straight": 2,
-            "Three of a Kind": 4,
-            "Straight Flush": 5
-        }
-
-        # Payout for 'Pair Plus' bet
-        self.pair_plus_payout = {
-            "High Card": 0,
-            "Pair": 1,
-            "Flush": 4,
-            "Straight": 6,
-            "Three of a Kind": 25,
-            "Straight Flush": 40
-        }
-
-        # Rank order for cards
-        self.rank_order = {
-            '2': 2,
-            '3': 3,
-            '4': 4,
-            '5': 5,
-            '6': 6,
-            '7': 7,
-            '8': 8,
-            '9': 9,
-            '10': 10,
-            'J': 11,
-            'Q': 12,
-            'K': 13,
-            'A': 14
-        }
+        # Rules profile of the game's table
+        self.rules = machine.table.rules
+        self.startup_times['window'] = (time.perf_counter() - STARTED) * 1000
 
     def initUI(self):
         # Window setup
@@ -95,10 +335,8 @@ class ThreeCardPokerGame(QMainWindow):
         self.setGeometry(100, 100, 600, 900)
 
         # Background setup
-        background = QPixmap("imagaes/UI/1.png")
-        palette = QPalette()
-        palette.setBrush(QPalette.Window, QBrush(background))
-        self.setPalette(palette)
+        self.full_background = False
+        self.set_background(image_cache.cropped(self.BACKGROUND_PATH, self.BACKGROUND_SIZE))
 
         # Main layout setup
         main_layout = QVBoxLayout()
@@ -195,31 +433,52 @@ class ThreeCardPokerGame(QMainWindow):
         # Button layout setup
         self.bet_btn = QPushButton("Place Bet", self)
         self.bet_btn.setFont(button_font)
-        self.bet_btn.clicked.connect(self.place_bet)
+        self.bet_btn.clicked.connect(lambda: self.place_bet())
         self.bet_btn.setStyleSheet("background-color: #4CAF50; color: white;")
         button_layout.addWidget(self.bet_btn)
 
         self.play_btn = QPushButton("Play", self)
         self.play_btn.setFont(button_font)
-        self.play_btn.clicked.connect(self.play)
+        self.play_btn.clicked.connect(lambda: self.play())
         self.play_btn.setEnabled(False)
         self.play_btn.setStyleSheet("background-color: #B0B0B0; color: white;")
         button_layout.addWidget(self.play_btn)
 
         self.fold_btn = QPushButton("Fold", self)
         self.fold_btn.setFont(button_font)
-        self.fold_btn.clicked.connect(self.fold)
+        self.fold_btn.clicked.connect(lambda: self.fold())
         self.fold_btn.setEnabled(False)
         self.fold_btn.setStyleSheet("background-color: #B0B0B0; color: white;")
         button_layout.addWidget(self.fold_btn)
 
         self.quick_bet_btn = QPushButton("Same Bet Again", self)
         self.quick_bet_btn.setFont(button_font)
-        self.quick_bet_btn.clicked.connect(self.quick_bet)
+        self.quick_bet_btn.clicked.connect(lambda: self.quick_bet())
         self.quick_bet_btn.setEnabled(False)
         self.quick_bet_btn.setStyleSheet("background-color: #FF9800; color: white;")
         button_layout.addWidget(self.quick_bet_btn)
 
+        self.auto_play_btn = QPushButton("Auto Play/Fold", self)
+        self.auto_play_btn.setFont(button_font)
+        self.auto_play_btn.setCheckable(True)
+        self.auto_play_btn.toggled.connect(self.toggle_auto_play)
+        self.auto_play_btn.setStyleSheet("background-color: #B0B0B0; color: white;")
+        button_layout.addWidget(self.auto_play_btn)
+
+        self.fast_auto_btn = QPushButton("Fast Auto", self)
+        self.fast_auto_btn.setFont(button_font)
+        self.fast_auto_btn.setCheckable(True)
+        self.fast_auto_btn.clicked.connect(self.toggle_fast_auto)
+        self.fast_auto_btn.setStyleSheet("background-color: #B0B0B0; color: white;")
+        button_layout.addWidget(self.fast_auto_btn)
+
+        self.replay_btn = QPushButton("Replay", self)
+        self.replay_btn.setFont(button_font)
+        self.replay_btn.setCheckable(True)
+        self.replay_btn.clicked.connect(self.toggle_replay)
+        self.replay_btn.setStyleSheet("background-color: #B0B0B0; color: white;")
+        button_layout.addWidget(self.replay_btn)
+
         main_layout.addLayout(button_layout)
 
         central_widget = QWidget()
@@ -231,6 +490,32 @@ class ThreeCardPokerGame(QMainWindow):
         main_layout.setStretchFactor(middle_layout, 15)
         main_layout.setStretchFactor(bottom_layout, 2)
 
+    def set_background(self, background):
+        palette = QPalette()
+        palette.setBrush(QPalette.Window, QBrush(background))
+        self.setPalette(palette)
+
+    def resizeEvent(self, event):
+        # Past the starting size more of the background shows, so switch to the full image
+        size = event.size()
+        if not self.full_background and (size.width() > self.BACKGROUND_SIZE.width()
+                                         or size.height() > self.BACKGROUND_SIZE.height()):
+            self.full_background = True
+            self.set_background(QPixmap(self.BACKGROUND_PATH))
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if 'first_paint' not in self.startup_times:
+            self.startup_times['first_paint'] = (time.perf_counter() - STARTED) * 1000
+            if self.metrics is not None:
+                for name, ms in self.startup_times.items():
+                    self.metrics.add(f"startup.{name}", ms)
+            self.first_painted.emit()
+
+    def startup_report(self):
+        return ", ".join(f"{name} {ms:.0f} ms" for name, ms in self.startup_times.items())
+
     def get_card_image_path(self, card):
         # Get the image path for a card
         rank = card['rank']
@@ -246,132 +531,141 @@ class ThreeCardPokerGame(QMainWindow):
         folder = self.suit_to_folder[suit]
         return f"imagaes/cards/{folder}/ornamental-deck-{rank}-of-{folder}-clipart-xl.png"
 
+    def card_pixmap(self, path, size):
+        # Load and scale a card image the first time it is needed, later deals reuse it.
+        # The card labels have a fixed size, so cached pixmaps never need rescaling.
+        key = (path, size.width(), size.height())
+        pixmap = self.pixmap_cache.get(key)
+        if pixmap is None:
+            pixmap = self.load_pixmap(path, size)
+            self.pixmap_cache[key] = pixmap
+        return pixmap
+
+    def load_pixmap(self, path, size):
+        # Read a card image scaled to size, from the image cache after the first run
+        return image_cache.scaled(path, size)
+
+    def preload_card_images(self, remaining=None):
+        # Fill the pixmap cache one image per event loop pass, so the window stays responsive
+        if remaining is None:
+            remaining = [(self.get_card_image_path({'rank': rank, 'suit': suit}), self.CARD_IMAGE_SIZE)
+                         for rank in self.ranks for suit in self.suits]
+            remaining.append((self.CARD_BACK_PATH, self.CARD_BACK_SIZE))
+        if remaining:
+            path, size = remaining.pop()
+            self.card_pixmap(path, size)
+            QTimer.singleShot(0, lambda: self.preload_card_images(remaining))
+
+    def clear_pixmap_cache(self):
+        # Drop the cached card images, they are reloaded on the next deal
+        self.pixmap_cache.clear()
+
     def set_card_images(self, labels, hand):
         # Set the images for the cards
         for i in range(3):
             card = hand[i]
             card_image_path = self.get_card_image_path(card)
-            pixmap = QPixmap(card_image_path).scaled(QSize(100, 150), Qt.KeepAspectRatio)
-            labels[i].setPixmap(pixmap)
+            labels[i].setPixmap(self.card_pixmap(card_image_path, self.CARD_IMAGE_SIZE))
             labels[i].setScaledContents(True)
 
-    def shuffled_deck(self):
+    @staticmethod
+    def shuffled_deck():
         # Create a shuffled deck
-        deck = [{'rank': rank, 'suit': suit} for rank in self.ranks for suit in self.suits]
-        random.shuffle(deck)
-        return deck
+        return poker_engine.shuffled_deck()
 
-    def is_straight(self, cards):
+    @staticmethod
+    def is_straight(cards):
         # Check if the hand is a straight
-        rank_values = list(map(lambda card: self.ranks.index(card['rank']), cards))
-        rank_values.sort()
-        if rank_values == [0, 1, 12]:  # A-2-3 count as a straight but smallest (not defined in the rules)
-            return True
-        return rank_values[2] - rank_values[0] == 2 and len(set(rank_values)) == 3
+        return poker_engine.is_straight(cards)
 
     @staticmethod
     def is_flush(cards):
         # Check if the hand is a flush
-        return len(set(card['suit'] for card in cards)) == 1
+        return poker_engine.is_flush(cards)
 
-    def hand_strength(self, cards):
+    @staticmethod
+    def hand_strength(cards):
         # Determine the strength of the hand
-        hand_type = self.evaluate_hand(cards)
-        strengths = {
-            "High Card": 1,
-            "Pair": 2,
-            "Flush": 3,
-            "Straight": 4,
-            "Three of a Kind": 5,
-            "Straight Flush": 6
-        }
-        return strengths.get(hand_type, 0)
-
-    def compare_hands(self, player, dealer):
+        return poker_engine.hand_strength(cards)
+
+    @staticmethod
+    def compare_hands(player, dealer):
         # Compare the player's hand to the dealer's hand
-        player_strength = self.hand_strength(player)
-        dealer_strength = self.hand_strength(dealer)
+        return poker_engine.compare_hands(player, dealer)
 
-        if player_strength > dealer_strength:
-            return "Player"
-        elif player_strength < dealer_strength:
-            return "Dealer"
-        else:
-            player_ranks = sorted([card['rank'] for card in player], key=lambda x: self.rank_order[x], reverse=True)
-            dealer_ranks = sorted([card['rank'] for card in dealer], key=lambda x: self.rank_order[x], reverse=True)
-
-            if player_strength == 1:  # High Card
-                for p_rank, d_rank in zip(player_ranks, dealer_ranks):
-                    if self.rank_order[p_rank] > self.rank_order[d_rank]:
-                        return "Player"
-                    elif self.rank_order[p_rank] < self.rank_order[d_rank]:
-                        return "Dealer"
-                return "Tie"
-
-            elif player_strength == 2:  # Pair
-                player_pair_rank = max(player_ranks, key=player_ranks.count)
-                dealer_pair_rank = max(dealer_ranks, key=dealer_ranks.count)
-                if self.rank_order[player_pair_rank] > self.rank_order[dealer_pair_rank]:
-                    return "Player"
-                elif self.rank_order[player_pair_rank] < self.rank_order[dealer_pair_rank]:
-                    return "Dealer"
-                else:
-                    player_non_pair_rank = min(player_ranks, key=player_ranks.count)
-                    dealer_non_pair_rank = min(dealer_ranks, key=dealer_ranks.count)
-                    if self.rank_order[player_non_pair_rank] > self.rank_order[dealer_non_pair_rank]:
-                        return "Player"
-                    elif self.rank_order[player_non_pair_rank] < self.rank_order[dealer_non_pair_rank]:
-                        return "Dealer"
-                    else:
-                        return "Tie"
-
-            else:  # Flush, Straight, Three of a Kind, Straight Flush
-                for p_rank, d_rank in zip(player_ranks, dealer_ranks):
-                    if self.rank_order[p_rank] > self.rank_order[d_rank]:
-                        return "Player"
-                    elif self.rank_order[p_rank] < self.rank_order[d_rank]:
-                        return "Dealer"
-                return "Tie"
-
-    def evaluate_hand(self, cards):
+    @staticmethod
+    def evaluate_hand(cards):
         # Evaluate the type of hand
-        if self.is_straight(cards) and self.is_flush(cards):
-            return "Straight Flush"
-        if len(set(card['rank'] for card in cards)) == 1:
-            return "Three of a Kind"
-        if self.is_straight(cards):
-            return "Straight"
-        if self.is_flush(cards):
-            return "Flush"
-        if len(set(card['rank'] for card in cards)) == 2:
-            return "Pair"
-        return "High Card"
+        return poker_engine.evaluate_hand(cards)
 
     def place_bet(self):
         # Place the bet
-        ante_bet, ok1 = QInputDialog.getInt(self, "Bet", "Enter your Ante bet (min $1, max $50000):", min=1, max=50000)
-        if not ok1:
+        bets = self.ask_bets()
+        if bets is None:
             return
-        pair_plus_bet, ok2 = QInputDialog.getInt(self, "Bet", "Enter your Pair Plus bet (min $0, max $5000):", min=0,
-                                                 max=5000)
+        self.set_buttons_waiting()
+        self.bet_requested.emit(*bets)
+
+    def ask_bets(self):
+        # Ask for the Ante and Pair Plus bets, None if cancelled
+        ante_min, ante_max = poker_engine.ANTE_LIMITS
+        pair_plus_min, pair_plus_max = poker_engine.PAIR_PLUS_LIMITS
+        ante_bet, ok1 = QInputDialog.getInt(self, "Bet", f"Enter your Ante bet (min ${ante_min}, max ${ante_max}):",
+                                            min=ante_min, max=ante_max)
+        if not ok1:
+            return None
+        pair_plus_bet, ok2 = QInputDialog.getInt(
+            self, "Bet", f"Enter your Pair Plus bet (min ${pair_plus_min}, max ${pair_plus_max}):",
+            min=pair_plus_min, max=pair_plus_max)
         if not ok2:
             pair_plus_bet = 0
+        return ante_bet, pair_plus_bet
 
-        if ante_bet + pair_plus_bet > self.player_balance:
-            QMessageBox.critical(self, "Error", "You don't have enough balance for this bet!")
-            return
-
-        self.ante_bet = ante_bet
-        self.pair_plus_bet = pair_plus_bet
+    def quick_bet(self):
+        # Place a quick bet
+        self.set_buttons_waiting()
+        self.rebet_requested.emit()
 
-        self.profited = - self.ante_bet - self.pair_plus_bet
-        self.bet_btn.setEnabled(False)
-        self.bet_btn.setStyleSheet("background-color: #B0B0B0; color: white;")
-        self.initialize_game()
-        self.deal_hand()
+    def play(self):
+        self.set_buttons_waiting()
+        self.play_requested.emit()
 
-        self.last_ante_bet = self.ante_bet
-        self.last_pair_plus_bet = self.pair_plus_bet
+    def fold(self):
+        self.set_buttons_waiting()
+        self.fold_requested.emit()
+
+    def set_buttons_waiting(self):
+        # Disable the game buttons until the worker answers
+        for button in (self.bet_btn, self.play_btn, self.fold_btn, self.quick_bet_btn):
+            button.setEnabled(False)
+
+    def set_buttons_for_phase(self, phase):
+        # Enable the buttons that make sense in a game_state phase
+        betting = phase == game_state.BETTING
+        dealt = phase == game_state.DEALT
+        self.bet_btn.setEnabled(betting)
+        self.bet_btn.setStyleSheet(f"background-color: {'#4CAF50' if betting else '#B0B0B0'}; color: white;")
+        self.quick_bet_btn.setEnabled(betting)
+        self.play_btn.setEnabled(dealt)
+        self.play_btn.setStyleSheet(f"background-color: {'#4CAF50' if dealt else '#B0B0B0'}; color: white;")
+        self.fold_btn.setEnabled(dealt)
+        self.fold_btn.setStyleSheet(f"background-color: {'#F44336' if dealt else '#B0B0B0'}; color: white;")
+
+    def show_error(self, message):
+        # The worker refused a request, the round stays where it was
+        QMessageBox.critical(self, "Error", message)
+        self.set_buttons_for_phase(self.round_state.phase)
+
+    def apply_state(self, state):
+        # Take over a RoundState from the worker
+        self.round_state = state
+        self.player_balance = state.balance
+        self.player_hand = state.player_hand
+        self.dealer_hand = state.dealer_hand
+        self.ante_bet = state.ante_bet
+        self.pair_plus_bet = state.pair_plus_bet
+        self.play_bet = state.play_bet
+        self.profited = state.profited
 
     def initialize_game(self):
         # Initialize the game
@@ -383,154 +677,200 @@ class ThreeCardPokerGame(QMainWindow):
         self.ante_bet_label.setText(f"Ante\n${self.ante_bet}")
         self.pair_plus_bet_label.setText(f"Pair Plus\n${self.pair_plus_bet}")
         self.play_bet_label.setText(f"Play\n${self.play_bet}")
-        self.play_btn.setEnabled(False)
-        self.fold_btn.setEnabled(False)
         self.quick_bet_btn.setVisible(False)
         self.payout_details_label.setText("")
 
-    def draw_cards(self):
-        # Draw cards from the deck
-        hand = [self.deck.pop(), self.deck.pop(), self.deck.pop()]
-        sorted_hand = sorted(hand, key=lambda card: self.rank_order[card['rank']], reverse=True)
-        return sorted_hand
-
-    def deal_hand(self):
-        # Deal the hand
-        self.player_hand = self.draw_cards()
+    def deal_hand(self, state):
+        # Show a dealt hand
+        self.apply_state(state)
+        self.initialize_game()
+        render_start = time.perf_counter()
         self.set_card_images(self.player_hand_labels, self.player_hand)
 
         # Set dealer's cards to back image
-        back_image_path = "imagaes/cards/card_back/card-backs-grid-red-clipart-xl.png"
+        back_pixmap = self.card_pixmap(self.CARD_BACK_PATH, self.CARD_BACK_SIZE)
         for label in self.dealer_hand_labels:
-            pixmap = QPixmap(back_image_path).scaled(QSize(110, 150), Qt.KeepAspectRatio)
-            label.setPixmap(pixmap)
+            label.setPixmap(back_pixmap)
             label.setScaledContents(True)
+        self.last_render_ms = (time.perf_counter() - render_start) * 1000
+
+        self.set_buttons_for_phase(state.phase)
+        if self.show_hints:
+            self.payout_details_label.setText(self.hint_text(state))
+
+        if self.strategy is not None:
+            QTimer.singleShot(self.AUTO_PLAY_DELAY_MS, self.auto_decide)
+
+    def toggle_hints(self):
+        self.show_hints = not self.show_hints
+        if self.show_hints and self.round_state.phase == game_state.DEALT:
+            self.payout_details_label.setText(self.hint_text(self.round_state))
+        elif not self.show_hints:
+            self.payout_details_label.setText("")
+
+    def hint_text(self, state):
+        # Exact value of playing and folding the dealt hand, in dollars. Exact only when
+        # every round comes from a full single deck.
+        dealer_shoe = self.worker.machine.table.shoe
+        if dealer_shoe.decks != 1 or dealer_shoe.mode == shoe.SHOE:
+            return "Hint: only for a single deck"
+        import equity  # needs NumPy, only loaded when hints are used
+        result = equity.hand_equity(state.player_hand, self.rules, state.pair_plus_bet / state.ante_bet)
+        return (f"Hint: {'Play' if result['play'] else 'Fold'}\n"
+                f"Play ${result['play_ev'] * state.ante_bet:+.2f}\n"
+                f"Fold ${result['fold_ev'] * state.ante_bet:+.2f}\n"
+                f"Dealer qualifies {result['dealer_qualifies']:.0%}")
+
+    def toggle_auto_play(self, checked):
+        # Let a strategy decide play or fold after each deal
+        if checked:
+            import strategy  # needs NumPy, only loaded when auto play is used
+            self.strategy = strategy.MinimumHand('Q', '6', '4')
+            self.auto_play_btn.setText(f"Auto: {self.strategy.name}")
+            self.auto_play_btn.setStyleSheet("background-color: #2196F3; color: white;")
+        else:
+            self.strategy = None
+            self.auto_play_btn.setText("Auto Play/Fold")
+            self.auto_play_btn.setStyleSheet("background-color: #B0B0B0; color: white;")
 
-        self.play_btn.setEnabled(True)
-        self.fold_btn.setEnabled(True)
-        self.play_btn.setStyleSheet("background-color: #4CAF50; color: white;")
-        self.fold_btn.setStyleSheet("background-color: #F44336; color: white;")
-
-    def quick_bet(self):
-        # Place a quick bet
-        if self.last_ante_bet + self.last_pair_plus_bet > self.player_balance:
-            QMessageBox.critical(self, "Error", "You don't have enough balance for this bet!")
+    def auto_decide(self):
+        # Play or fold the current hand with the selected strategy
+        if self.strategy is None or not self.play_btn.isEnabled():
             return
+        if self.strategy.decide_hand(self.player_hand):
+            self.play()
+        else:
+            self.fold()
 
-        self.ante_bet = self.last_ante_bet
-        self.pair_plus_bet = self.last_pair_plus_bet
-
-        self.profited = - self.ante_bet - self.pair_plus_bet
-        self.bet_btn.setEnabled(False)
-        self.initialize_game()
-        self.deal_hand()
-        self.quick_bet_btn.setVisible(False)
-        self.bet_btn.setEnabled(False)
-        self.bet_btn.setStyleSheet("background-color: #B0B0B0; color: white;")
-        self.play_btn.setEnabled(True)
-        self.play_btn.setStyleSheet("background-color: #4CAF50; color: white;")
-        self.fold_btn.setEnabled(True)
-        self.fold_btn.setStyleSheet("background-color: #F44336; color: white;")
-        self.payout_details_label.setText("")
-
-    def play(self):
-        if self.ante_bet > self.player_balance:
-            QMessageBox.critical(self, "Error", "You don't have enough balance for this bet!")
+    def toggle_fast_auto(self, checked):
+        # Play rounds as fast as the worker can, with the auto play strategy and the last bets
+        if not checked:
+            self.auto_stop_requested.emit()
+            return
+        bets = (self.ante_bet, self.pair_plus_bet) if self.ante_bet else None
+        if self.round_state.phase == game_state.BETTING and bets is None:
+            bets = self.ask_bets()
+        if self.round_state.phase != game_state.BETTING or bets is None:
+            self.fast_auto_btn.setChecked(False)
+            return
+        import strategy  # needs NumPy, only loaded when auto play is used
+        play_strategy = self.strategy or strategy.MinimumHand('Q', '6', '4')
+        self.start_auto(autoplay.StrategyRounds(self.worker.machine, play_strategy, *bets))
+
+    def toggle_replay(self, checked):
+        # Replay a hand history file quickly, a paused replay carries on where it stopped
+        if not checked:
+            self.auto_stop_requested.emit()
             return
+        # A replay draws over the table, so not while a live hand is waiting for Play or Fold
+        if self.round_state.phase != game_state.BETTING:
+            self.replay_btn.setChecked(False)
+            return
+        if self.replay is None:
+            path, _ = QFileDialog.getOpenFileName(self, "Replay", "", "Hand history (*.hist)")
+            try:
+                self.replay = autoplay.HistoryRounds(path) if path else None
+            except (OSError, ValueError) as e:
+                QMessageBox.critical(self, "Error", str(e))
+            if self.replay is None:
+                self.replay_btn.setChecked(False)
+                return
+        self.start_auto(self.replay)
+
+    def start_auto(self, source):
+        # Hand a round source to the worker and start redrawing at the capped rate
+        self.set_buttons_waiting()
+        self.auto_play_btn.setEnabled(False)
+        (self.replay_btn if source.live else self.fast_auto_btn).setEnabled(False)
+        self.auto_live = source.live
+        self.auto_state = None
+        self.auto_rounds = 0
+        self.auto_started = time.perf_counter()
+        self.auto_refresh.start(self.AUTO_REFRESH_MS)
+        self.auto_requested.emit(source)
+
+    def auto_progressed(self, state, rounds):
+        # Keep only the latest round, refresh_auto draws it
+        self.auto_state = state
+        self.auto_rounds = rounds
+
+    def refresh_auto(self):
+        if self.auto_state is not None:
+            self.show_round(self.auto_state, self.auto_status(self.auto_state, self.auto_rounds))
+            self.auto_state = None
+
+    def auto_status(self, state, rounds):
+        rate = rounds / max(time.perf_counter() - self.auto_started, 1e-9)
+        return f"{'Auto' if self.auto_live else 'Replay'} round {state.round:,}\n{rounds:,} rounds, {rate:,.0f}/s"
+
+    def auto_stopped(self, state, rounds, reason):
+        # Draw the last round and hand the table back to the player
+        self.auto_refresh.stop()
+        self.auto_state = None
+        for button in (self.fast_auto_btn, self.replay_btn):
+            button.setChecked(False)
+            button.setEnabled(True)
+        self.auto_play_btn.setEnabled(True)
+        if state is not None:
+            self.show_round(state, f"{reason}\n{self.auto_status(state, rounds)}")
         else:
-            self.play_bet = self.ante_bet
-            self.profited -= self.play_bet
-            self.play_bet_label.setText(f"Play\n${self.play_bet}")
-
-        self.dealer_hand = self.draw_cards()
-        self.set_card_images(self.dealer_hand_labels, self.dealer_hand)
-
-        result = self.compare_hands(self.player_hand, self.dealer_hand)
-        player_hand_type = self.evaluate_hand(self.player_hand)
-
-        dealer_qualified = (self.hand_strength(self.dealer_hand) > 1 or self.hand_strength(self.dealer_hand) == 1
-                            and self.rank_order[self.dealer_hand[0]['rank']] > 11)
-
-        if not dealer_qualified:
-            result = "Player"
-
-        if result == "Player":
-            # winning amounts
-            ante_winnings = self.ante_bet * (self.ante_payout[player_hand_type] + 1) if dealer_qualified else self.ante_bet * 2
-            pair_plus_winnings = self.pair_plus_bet * self.pair_plus_payout[player_hand_type]
-            play_winnings = self.ante_bet * (self.play_payout[player_hand_type] + 1) if dealer_qualified else self.ante_bet
-
-            # display payout details
-            self.payout_details = f"Ante Win: ${ante_winnings}\nPair Plus Win: ${pair_plus_winnings}\nPlay Win: ${play_winnings}\nTotal Win: ${ante_winnings + pair_plus_winnings + play_winnings}" if dealer_qualified else f"[Dealer Not Qulified]\nAnte Win: ${ante_winnings}\nPair Plus Win: ${pair_plus_winnings}\nPlay Win: ${play_winnings}\nTotal Win: ${ante_winnings + pair_plus_winnings + play_winnings}"
-
-            # update profited amount
-            self.profited = self.profited + ante_winnings + pair_plus_winnings + play_winnings
-
-        elif result == "Dealer":
-            # winning amounts
-            pair_plus_winnings = self.pair_plus_bet * self.pair_plus_payout[player_hand_type]
-
-            # display payout details
-            self.payout_details = f"Pair Plus Win: ${pair_plus_winnings}\nTotal Win: ${pair_plus_winnings}"
-
-            # update profited amount
-            self.profited = self.profited + pair_plus_winnings
-
+            self.payout_details_label.setText(reason)
+        if self.auto_live:
+            if state is not None:
+                self.apply_state(state)
+                # The worker has already moved on to the next round
+                self.round_state.phase = game_state.GAME_OVER if state.game_over else game_state.BETTING
+                self.quick_bet_btn.setVisible(True)
         else:
-            # winning amounts
-            ante_winnings = self.ante_bet
-            pair_plus_winnings = self.pair_plus_bet * self.pair_plus_payout[player_hand_type]
-
-            # display payout details
-            self.payout_details = f"Ante Win: ${ante_winnings}\nPair Plus Win: ${pair_plus_winnings}\nTotal Win: ${ante_winnings + pair_plus_winnings}"
-
-            # update profited amount
-            self.profited = self.profited + ante_winnings + pair_plus_winnings
-
-        self.player_balance += self.profited
+            if self.replay is not None and self.replay.position >= len(self.replay.history):
+                self.replay = None
+            self.update_balance()
+        self.set_buttons_for_phase(self.round_state.phase)
+
+    def show_round(self, state, status):
+        # Draw a settled round in one go, for fast auto play and replay
+        self.set_card_images(self.player_hand_labels, state.player_hand)
+        if state.dealer_hand:
+            self.set_card_images(self.dealer_hand_labels, state.dealer_hand)
+        else:
+            back_pixmap = self.card_pixmap(self.CARD_BACK_PATH, self.CARD_BACK_SIZE)
+            for label in self.dealer_hand_labels:
+                label.setPixmap(back_pixmap)
+                label.setScaledContents(True)
+        self.ante_bet_label.setText(f"Ante\n${state.ante_bet}")
+        self.pair_plus_bet_label.setText(f"Pair Plus\n${state.pair_plus_bet}")
+        self.play_bet_label.setText(f"Play\n${state.play_bet}")
+        self.profited_label.setText(f"Profited: ${state.profited}")
+        self.balance_label.setText(f"Balance: ${state.balance}")
+        self.payout_details_label.setText(status)
+
+    def payout_text(self, state):
+        # Payout details of a settled round
+        ante_winnings, pair_plus_winnings, play_winnings = state.winnings
+        if state.result == "Fold":
+            return ""
+        if state.result == "Player":
+            details = f"Ante Win: ${ante_winnings}\nPair Plus Win: ${pair_plus_winnings}\nPlay Win: ${play_winnings}\nTotal Win: ${ante_winnings + pair_plus_winnings + play_winnings}"
+            return details if state.dealer_qualified else f"[Dealer Not Qulified]\n{details}"
+        if state.result == "Dealer":
+            return f"Pair Plus Win: ${pair_plus_winnings}\nTotal Win: ${pair_plus_winnings}"
+        return f"Ante Win: ${ante_winnings}\nPair Plus Win: ${pair_plus_winnings}\nTotal Win: ${ante_winnings + pair_plus_winnings}"
+
+    def finish_game(self, state):
+        # Show a settled round
+        self.apply_state(state)
+        if self.dealer_hand:
+            self.play_bet_label.setText(f"Play\n${self.play_bet}")
+            self.set_card_images(self.dealer_hand_labels, self.dealer_hand)
+        self.payout_details = self.payout_text(state)
         self.profited_label.setText(f"Profited: ${self.profited}")
         self.payout_details_label.setText(self.payout_details)
-        self.finish_game()
-
-    def record(self):
-        self.logger.info(f"[Game Round: {self.game_round}   {self.compare_hands(self.player_hand, self.dealer_hand)} wins]")
-        player_cards = ', '.join([f"{card['rank']}{card['suit']}" for card in self.player_hand])
-        dealer_cards = ', '.join([f"{card['rank']}{card['suit']}" for card in self.dealer_hand])
-        self.logger.info(f"Player: {player_cards}, {self.evaluate_hand(self.player_hand)}")
-        self.logger.info(f"Dealer: {dealer_cards}, {self.evaluate_hand(self.dealer_hand)}")
-        self.logger.info("============= BET ==============")
-        self.logger.info(f"Ante: {self.ante_bet}")
-        self.logger.info(f"Pair Plus: {self.pair_plus_bet}")
-        self.logger.info(f"Play: {self.play_bet}")
-        self.logger.info("============= WIN ==============")
-        self.logger.info(f"{self.payout_details_label.text()}")
-        self.logger.info("============= KEY ==============")
-        self.logger.info(f"Balance: {self.player_balance}")
-        self.logger.info(f"Profited: {self.profited}\n\n")
-        self.game_round += 1
-
-    def fold(self):
-        self.player_balance += self.profited
-        self.profited_label.setText(f"Profited: ${self.profited}")
-        self.payout_details_label.setText("")
-        self.finish_game()
-
-    def finish_game(self):
         self.update_balance()
-        self.record()  # for testing only (logging)
-        self.bet_btn.setEnabled(True)
-        self.bet_btn.setStyleSheet("background-color: #4CAF50; color: white;")
-        self.play_btn.setEnabled(False)
-        self.play_btn.setStyleSheet("background-color: #B0B0B0; color: white;")
-        self.fold_btn.setEnabled(False)
-        self.fold_btn.setStyleSheet("background-color: #B0B0B0; color: white;")
-        self.quick_bet_btn.setVisible(True)
-        self.play_bet = 0
-        self.ante_bet = 0
-        self.pair_plus_bet = 0
-        self.deck = self.shuffled_deck()
+        # The worker has already moved on to the next round
+        self.round_state.phase = game_state.GAME_OVER if state.game_over else game_state.BETTING
+        self.set_buttons_for_phase(self.round_state.phase)
 
-        if self.player_balance < 10:
+        if state.game_over:
             self.payout_details_label.setText("No Money! Game Over!")
             self.close()
         else:
@@ -540,9 +880,96 @@ class ThreeCardPokerGame(QMainWindow):
     def update_balance(self):
         self.balance_label.setText(f"Balance: ${self.player_balance}")
 
+    def init_stats_panel(self):
+        # Session stats over the top right of the window, F2 toggles them and F6 exports them.
+        # The panel itself is made the first time it is shown.
+        self.stats_label = None
+        QShortcut(QKeySequence(Qt.Key_F2), self, self.toggle_stats_panel)
+        QShortcut(QKeySequence(Qt.Key_F6), self, self.export_stats)
+
+    def toggle_stats_panel(self):
+        if self.stats_label is None:
+            self.stats_label = QLabel(self)
+            self.stats_label.setFont(QFont("Courier", 9))
+            self.stats_label.setStyleSheet("background-color: rgba(0, 0, 0, 170); color: white; padding: 4px;")
+            self.stats_label.setAttribute(Qt.WA_TransparentForMouseEvents)
+            self.stats_label.hide()
+        self.stats_label.setVisible(self.stats_label.isHidden())
+        if self.stats_label.isVisible():
+            self.show_stats()
+            self.stats_label.raise_()
+
+    def update_stats(self, stats):
+        self.session_stats = stats
+        if self.stats_label is not None and self.stats_label.isVisible():
+            self.show_stats()
+
+    def show_stats(self):
+        self.stats_label.setText(self.session_stats.report() + "\n(F6 exports them)")
+        self.stats_label.adjustSize()
+        self.stats_label.move(self.width() - self.stats_label.width() - 8, 8)
+
+    def export_stats(self):
+        # Save the session stats as JSON
+        path, _ = QFileDialog.getSaveFileName(self, "Export Statistics", "session_stats.json", "JSON (*.json)")
+        if path:
+            self.session_stats.dump(path)
+            self.payout_details_label.setText(f"Statistics saved to {path}")
+
+    def init_metrics_overlay(self):
+        # Timings drawn over the top left of the window, F3 toggles them and F4 dumps them
+        self.metrics_label = QLabel(self)
+        self.metrics_label.setFont(QFont("Courier", 9))
+        self.metrics_label.setStyleSheet("background-color: rgba(0, 0, 0, 170); color: white; padding: 4px;")
+        self.metrics_label.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.metrics_label.hide()
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.timeout.connect(self.update_metrics_overlay)
+        QShortcut(QKeySequence(Qt.Key_F3), self, self.toggle_metrics_overlay)
+        QShortcut(QKeySequence(Qt.Key_F4), self, self.dump_metrics)
+
+    def toggle_metrics_overlay(self):
+        if self.metrics_label.isVisible():
+            self.metrics_timer.stop()
+            self.metrics_label.hide()
+        else:
+            self.update_metrics_overlay()
+            self.metrics_label.show()
+            self.metrics_label.raise_()
+            self.metrics_timer.start(self.METRICS_REFRESH_MS)
+
+    def update_metrics_overlay(self):
+        self.metrics_label.setText(self.metrics.report() + "\n(times in ms, F4 saves them)")
+        self.metrics_label.adjustSize()
+
+    def dump_metrics(self):
+        # Write the timings to the THREE_CARD_METRICS file
+        self.metrics.dump(self.metrics_path)
+        self.payout_details_label.setText(f"Metrics saved to {self.metrics_path}")
+
+    def closeEvent(self, event):
+        # Stop the worker and write out the rest of the round log and hand history
+        if self.worker_thread is not None:
+            self.worker_thread.quit()
+            self.worker_thread.wait()
+            self.worker_thread = None
+        self.worker.close()
+        if self.metrics is not None:
+            self.metrics.dump(self.metrics_path)
+        super().closeEvent(event)
+
 
 if __name__ == "__main__":
     app = QApplication([])
     game = ThreeCardPokerGame()
+    # THREE_CARD_STARTUP=1 prints how long startup took
+    if os.environ.get('THREE_CARD_STARTUP'):
+        game.first_painted.connect(lambda: print(f"Startup: {game.startup_report()}"))
     game.show()
-    app.exec_()
+    # THREE_CARD_PROFILE=file runs the session under cProfile, the worker thread's
+    # profile is saved beside it
+    profile_path = os.environ.get('THREE_CARD_PROFILE')
+    if profile_path:
+        metrics.profile_call(profile_path, app.exec_)
+    else:
+        app.exec_()
@@ -0,0 +1,72 @@
+import game_state
+import hand_table
+import poker_engine
+
+# Rounds for the game's fast auto play and replay, with no UI in them.
+#
+# A round source hands out one settled RoundState per call to next_round(), or None
+# when it has no more. StrategyRounds plays live rounds through the game's state
+# machine, a strategy choosing play or fold, and leaves recording the round and
+# moving the machine on to its caller. HistoryRounds replays a hand history file
+# and touches no game state. pause_reason() picks out rounds worth stopping on.
+
+# Hands that stop auto play so they can be seen, in the player's or the dealer's cards
+PAUSE_CATEGORIES = {"Straight Flush"}
+
+
+class StrategyRounds:
+    live = True
+
+    def __init__(self, machine, strategy, ante_bet, pair_plus_bet):
+        self.machine = machine
+        self.strategy = strategy
+        self.ante_bet = ante_bet
+        self.pair_plus_bet = pair_plus_bet
+
+    def next_round(self):
+        # Bet, deal and play or fold one round; ValueError if the bets can't be placed
+        if self.machine.phase != game_state.BETTING:
+            return None
+        state = self.machine.place_bet(self.ante_bet, self.pair_plus_bet)
+        if self.strategy.decide_hand(state.player_hand):
+            return self.machine.play()
+        return self.machine.fold()
+
+
+class HistoryRounds:
+    live = False
+
+    def __init__(self, path):
+        import hand_history  # needs NumPy, only loaded for replays
+        self.path = path
+        self.history = hand_history.load(path)
+        self.results = hand_history.RESULTS
+        self.position = 0
+
+    def next_round(self):
+        # The next recorded round as a settled RoundState (winnings aren't recorded)
+        if self.position >= len(self.history):
+            return None
+        record = self.history[self.position]
+        self.position += 1
+        cards = [hand_table.int_to_card(int(card)) for card in record['cards'] if card < hand_table.NUM_CARDS]
+        balance = int(record['balance'])
+        return game_state.RoundState(
+            self.position, game_state.SETTLED, cards[:3], cards[3:], int(record['ante']), int(record['pair_plus']),
+            int(record['play']), self.results[record['result']], bool(record['dealer_qualified']), None,
+            int(record['profit']), balance, balance < poker_engine.MIN_BALANCE)
+
+
+def hand_category(cards):
+    # Hand type name of three card dicts
+    return hand_table.category(hand_table.strength(*hand_table.encode_hand(cards)))
+
+
+def pause_reason(state):
+    # Why auto play should stop on this settled round, or None to carry on
+    if state.game_over:
+        return "No Money! Game Over!"
+    for owner, cards in (("You", state.player_hand), ("Dealer", state.dealer_hand)):
+        if cards and hand_category(cards) in PAUSE_CATEGORIES:
+            return f"{owner}: {hand_category(cards)}!"
+    return None
@@ -0,0 +1,156 @@
+import sys
+import time
+
+import numpy as np
+
+import hand_table
+import house_edge
+import poker_engine
+import profiles
+import simulator
+import strategy as strategies
+
+# Bankroll and risk of ruin over whole playing sessions.
+#
+# A session starts with a bankroll and plays the same Ante and Pair Plus bets every
+# hand until it is ruined, reaches an optional target or has played its hands. It is
+# ruined like the game ends: when the balance can't cover the next bets or drops below
+# poker_engine.MIN_BALANCE.
+#
+# The profit of one hand takes only a few values, and their exact probabilities
+# follow from house_edge.dealer_counts for the strategy's decisions. Sessions are
+# then simulated as (sessions, hands) arrays of profits drawn from that distribution,
+# in blocks so memory stays flat, and the balance paths are their running sums.
+
+BLOCK_CELLS = 2_000_000
+
+PERCENTILES = [10, 50, 90, 99]
+
+
+def round_distribution(ante_bet, pair_plus_bet, strategy='q64', rules=None):
+    # Exact distribution of one hand's profit: sorted profit values and their probabilities
+    rules = profiles.get(rules)
+    counts = house_edge.dealer_counts(rules.qualify_strength)
+    play = strategies.as_strategy(strategy, rules).table()
+    categories = np.frombuffer(hand_table.STRENGTHS, dtype=np.int32) >> 12
+    payouts = simulator.payout_arrays(rules)
+
+    # Pair Plus and the Ante bonus don't depend on the dealer's hand
+    side = (pair_plus_bet * (payouts['pair_plus_payout'] - 1) + ante_bet * payouts['ante_bonus'])[categories]
+    win = ante_bet * (payouts['ante_payout'] + payouts['play_payout'])[categories]
+    outcomes = [
+        (counts['not_qualified'], ante_bet + side),
+        (counts['player_wins'], win + side),
+        (counts['ties'], -ante_bet + side),
+        (counts['dealer_wins'], -2 * ante_bet + side),
+    ]
+    profits = np.concatenate([np.where(play, profit, -ante_bet - pair_plus_bet) for _, profit in outcomes])
+    weights = np.concatenate([count for count, _ in outcomes]).astype(np.float64)
+    values, inverse = np.unique(profits, return_inverse=True)
+    probabilities = np.bincount(inverse, weights=weights) / (hand_table.NUM_HANDS * house_edge.DEALER_HANDS)
+    return values, probabilities
+
+
+def simulate_sessions(sessions, bankroll, ante_bet, pair_plus_bet=0, hands=500, target=None, strategy='q64',
+                      seed=None, rules=None):
+    # Play sessions sessions of up to hands hands. Returns per-session arrays: hands played,
+    # whether it was ruined or reached target, the final balance and the largest drawdown.
+    ante_min, ante_max = poker_engine.ANTE_LIMITS
+    pair_plus_min, pair_plus_max = poker_engine.PAIR_PLUS_LIMITS
+    if not ante_min <= ante_bet <= ante_max:
+        raise ValueError(f"Ante bet must be between ${ante_min} and ${ante_max}!")
+    if not pair_plus_min <= pair_plus_bet <= pair_plus_max:
+        raise ValueError(f"Pair Plus bet must be between ${pair_plus_min} and ${pair_plus_max}!")
+
+    values, probabilities = round_distribution(ante_bet, pair_plus_bet, strategy, rules)
+    cumulative = np.cumsum(probabilities)
+    cumulative /= cumulative[-1]
+    ruin_below = max(poker_engine.MIN_BALANCE, ante_bet + pair_plus_bet)
+    rng = np.random.default_rng(seed)
+
+    played = np.empty(sessions, dtype=np.int64)
+    ruined = np.empty(sessions, dtype=bool)
+    reached = np.empty(sessions, dtype=bool)
+    final = np.empty(sessions, dtype=np.int64)
+    drawdown = np.empty(sessions, dtype=np.int64)
+    if bankroll < ruin_below:
+        played[:], ruined[:], reached[:], final[:], drawdown[:] = 0, True, False, bankroll, 0
+        return {'hands': played, 'ruined': ruined, 'reached_target': reached, 'final_balance': final,
+                'max_drawdown': drawdown}
+
+    block = max(1, BLOCK_CELLS // hands)
+    steps = np.arange(hands)
+    for start in range(0, sessions, block):
+        count = min(block, sessions - start)
+        draws = np.searchsorted(cumulative, rng.random((count, hands)), side='right')
+        balance = bankroll + np.cumsum(values[np.minimum(draws, len(values) - 1)], axis=1)
+
+        broke = balance < ruin_below
+        done = broke | (balance >= target) if target is not None else broke
+        finished = done.any(axis=1)
+        stop = np.where(finished, done.argmax(axis=1), hands - 1)
+        rows = np.arange(count)
+
+        # Only the hands up to and including the stop count towards the drawdown
+        peak = np.maximum(np.maximum.accumulate(balance, axis=1), bankroll)
+        dips = np.where(steps <= stop[:, None], peak - balance, 0)
+
+        played[start:start + count] = stop + 1
+        ruined[start:start + count] = finished & broke[rows, stop]
+        reached[start:start + count] = finished & ~broke[rows, stop]
+        final[start:start + count] = balance[rows, stop]
+        drawdown[start:start + count] = dips.max(axis=1)
+    return {'hands': played, 'ruined': ruined, 'reached_target': reached, 'final_balance': final,
+            'max_drawdown': drawdown}
+
+
+def summarize(result, percentiles=PERCENTILES):
+    # Ruin probability, hands-to-ruin and drawdown percentiles of simulate_sessions' result
+    sessions = len(result['hands'])
+    ruined = result['ruined']
+    hands_to_ruin = result['hands'][ruined]
+    return {
+        'sessions': sessions,
+        'ruin_probability': ruined.mean(),
+        'target_probability': result['reached_target'].mean(),
+        'mean_hands': result['hands'].mean(),
+        'hands_to_ruin': {p: float(np.percentile(hands_to_ruin, p)) for p in percentiles} if ruined.any() else {},
+        'max_drawdown': {p: float(np.percentile(result['max_drawdown'], p)) for p in percentiles},
+        'final_balance': {p: float(np.percentile(result['final_balance'], p)) for p in percentiles},
+        'mean_final_balance': result['final_balance'].mean(),
+    }
+
+
+def report(summary):
+    # Format a summarize() result
+    lines = [
+        f"Sessions:            {summary['sessions']:,}",
+        f"Risk of ruin:        {summary['ruin_probability']:.4%}",
+        f"Reached target:      {summary['target_probability']:.4%}",
+        f"Mean hands played:   {summary['mean_hands']:.1f}",
+        f"Mean final balance:  ${summary['mean_final_balance']:,.2f}",
+    ]
+    for name, label in (('hands_to_ruin', "Hands to ruin"), ('max_drawdown', "Max drawdown"),
+                        ('final_balance', "Final balance")):
+        values = ', '.join(f"p{p} {value:,.0f}" for p, value in summary[name].items())
+        lines.append(f"{label + ':':<21}{values or 'no session was ruined'}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    # python bankroll.py [bankroll] [ante] [pair plus] [hands] [sessions] [target] [strategy] [rules profile]
+    args = sys.argv[1:]
+    bankroll = int(args[0]) if len(args) > 0 else 1000
+    ante_bet = int(args[1]) if len(args) > 1 else 25
+    pair_plus_bet = int(args[2]) if len(args) > 2 else 5
+    hands = int(args[3]) if len(args) > 3 else 500
+    sessions = int(args[4]) if len(args) > 4 else 100_000
+    target = int(args[5]) if len(args) > 5 and args[5] != '-' else None
+    strategy = args[6] if len(args) > 6 else 'q64'
+    rules = profiles.get(args[7] if len(args) > 7 else None)
+    start = time.perf_counter()
+    result = simulate_sessions(sessions, bankroll, ante_bet, pair_plus_bet, hands, target, strategy, rules=rules)
+    elapsed = time.perf_counter() - start
+    print(f"${bankroll:,} bankroll, ${ante_bet} Ante + ${pair_plus_bet} Pair Plus, up to {hands:,} hands"
+          + (f", target ${target:,}" if target else "") + f", {rules.name} ({elapsed:.2f}s)")
+    print(report(summarize(result)))
@@ -0,0 +1,73 @@
+import os
+import statistics
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+os.environ['THREE_CARD_LOG'] = ''
+os.environ['THREE_CARD_HISTORY'] = ''
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QPixmap
+from PyQt5.QtWidgets import QApplication
+
+import Three_Card_QT
+import game_state
+import poker_engine
+
+# Per-deal card rendering time with an empty pixmap cache, both with every full-size
+# image decoded and scaled (as before any caching) and with the small copies in
+# image_cache/, and with a warm pixmap cache.
+# Run from the repository root: python benchmarks/bench_card_images.py [deals]
+
+
+def load_full_size(path, size):
+    # How the game loaded a card before image_cache
+    return QPixmap(path).scaled(size, Qt.KeepAspectRatio)
+
+
+def deal_times(game, deals, cold, image_cache=True):
+    # Render time of each deal in milliseconds, for hands dealt by a separate state machine.
+    # image_cache=False decodes the full-size images instead of reading image_cache/.
+    machine = game_state.GameStateMachine(balance=deals + poker_engine.MIN_BALANCE)
+    if not image_cache:
+        game.load_pixmap = load_full_size
+    times = []
+    try:
+        for _ in range(deals):
+            if cold:
+                game.clear_pixmap_cache()
+            game.deal_hand(machine.place_bet(1, 0))
+            times.append(game.last_render_ms)
+            machine.fold()
+            machine.next_round()
+    finally:
+        if not image_cache:
+            del game.load_pixmap
+    return times
+
+
+def fill_cache(game):
+    # Load every card face and the card back into the pixmap cache
+    for rank in game.ranks:
+        for suit in game.suits:
+            game.card_pixmap(game.get_card_image_path({'rank': rank, 'suit': suit}), game.CARD_IMAGE_SIZE)
+    game.card_pixmap(game.CARD_BACK_PATH, game.CARD_BACK_SIZE)
+
+
+def main():
+    deals = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    app = QApplication([])
+    game = Three_Card_QT.ThreeCardPokerGame(threaded=False)
+    full_size = deal_times(game, deals, cold=True, image_cache=False)
+    cold = deal_times(game, deals, cold=True)
+    fill_cache(game)
+    warm = deal_times(game, deals, cold=False)
+    print(f"{'cache':<12}{'mean ms':>10}{'median ms':>12}{'max ms':>10}")
+    for name, times in (("full size", full_size), ("cold", cold), ("warm", warm)):
+        print(f"{name:<12}{statistics.mean(times):>10.3f}{statistics.median(times):>12.3f}{max(times):>10.3f}")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
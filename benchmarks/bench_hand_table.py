@@ -0,0 +1,72 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import hand_table
+import poker_engine
+
+# Hands/second for poker_engine (same code as the GUI methods) versus the lookup table.
+# Run: python benchmarks/bench_hand_table.py [number of hands]
+
+
+def random_hands(count, seed=0):
+    # Deal count player/dealer pairs as card int tuples
+    rng = random.Random(seed)
+    deals = []
+    for _ in range(count):
+        cards = rng.sample(range(hand_table.NUM_CARDS), 6)
+        deals.append((tuple(cards[:3]), tuple(cards[3:])))
+    return deals
+
+
+def rate(func, deals):
+    # Run func over every deal and return operations per second
+    start = time.perf_counter()
+    func(deals)
+    return len(deals) / (time.perf_counter() - start)
+
+
+def engine_evaluate(deals):
+    for player, _ in deals:
+        poker_engine.evaluate_hand(player)
+
+
+def engine_compare(deals):
+    for player, dealer in deals:
+        poker_engine.compare_hands(player, dealer)
+
+
+def table_evaluate(deals):
+    strengths = hand_table.STRENGTHS
+    hand_index = hand_table.hand_index
+    for player, _ in deals:
+        strengths[hand_index(*player)]
+
+
+def table_compare(deals):
+    strengths = hand_table.STRENGTHS
+    hand_index = hand_table.hand_index
+    for player, dealer in deals:
+        strengths[hand_index(*player)] > strengths[hand_index(*dealer)]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    deals = random_hands(count)
+    dict_deals = [([hand_table.int_to_card(c) for c in player], [hand_table.int_to_card(c) for c in dealer])
+                  for player, dealer in deals]
+
+    results = [
+        ("evaluate_hand", rate(engine_evaluate, dict_deals), rate(table_evaluate, deals)),
+        ("compare_hands", rate(engine_compare, dict_deals), rate(table_compare, deals)),
+    ]
+    print(f"{'operation':<16}{'engine/s':>14}{'table/s':>14}{'speedup':>10}")
+    for name, engine_rate, table_rate in results:
+        print(f"{name:<16}{engine_rate:>14,.0f}{table_rate:>14,.0f}{table_rate / engine_rate:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import poker_engine
+import shoe
+
+# Per-round deck cost: a fresh shuffled list of 52 card dicts every round (as before
+# shoe.py) versus drawing the round's six cards from each shoe mode.
+# Run: python benchmarks/bench_shoe.py [rounds]
+
+SPECS = ['single', 'shoe:6', 'csm:6', 'shoe:8']
+
+
+def fresh_deck_round(rounds):
+    for _ in range(rounds):
+        deck = poker_engine.shuffled_deck()
+        for _ in range(6):
+            deck.pop()
+
+
+def shoe_round(spec):
+    def run(rounds):
+        dealer = shoe.from_spec(spec)
+        for _ in range(rounds):
+            dealer.draw(3)
+            dealer.draw(3)
+            dealer.new_round()
+    return run
+
+
+def cost(func, rounds):
+    # Microseconds per round
+    start = time.perf_counter()
+    func(rounds)
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    baseline = cost(fresh_deck_round, rounds)
+    print(f"{'deck':<16}{'us/round':>10}{'speedup':>10}")
+    print(f"{'fresh deck':<16}{baseline:>10.2f}{1:>9.1f}x")
+    for spec in SPECS:
+        per_round = cost(shoe_round(spec), rounds)
+        print(f"{spec:<16}{per_round:>10.2f}{baseline / per_round:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
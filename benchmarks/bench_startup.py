@@ -0,0 +1,61 @@
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Time to first paint of the game window, each launch in a fresh interpreter. The
+# first launch fills the image and hand table caches and isn't counted, like a
+# kiosk's first run after install. Exits with status 1 when the median time to first
+# paint is over the target, so it can be used as a check.
+# Run: python benchmarks/bench_startup.py [launches] [target ms]
+
+TARGET_MS = 300
+
+LAUNCH = """
+import json
+import Three_Card_QT
+from PyQt5.QtWidgets import QApplication
+app = QApplication([])
+game = Three_Card_QT.ThreeCardPokerGame()
+game.first_painted.connect(lambda: (print(json.dumps(game.startup_times)), app.quit()))
+game.show()
+app.exec_()
+game.close()
+"""
+
+
+def launch():
+    # startup_times of one launch, plus the whole process run in 'process'
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get('QT_QPA_PLATFORM', 'offscreen'),
+               THREE_CARD_LOG='', THREE_CARD_HISTORY='')
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, '-c', LAUNCH], cwd=ROOT, env=env, capture_output=True, text=True,
+                            check=True).stdout
+    times = json.loads(output.strip().splitlines()[-1])
+    times['process'] = (time.perf_counter() - start) * 1000
+    return times
+
+
+def median_times(launches):
+    # Median of each startup step over launches, after one launch to fill the caches
+    launch()
+    runs = [launch() for _ in range(launches)]
+    return {name: sorted(run[name] for run in runs)[len(runs) // 2] for name in runs[0]}
+
+
+def main():
+    launches = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    target = float(sys.argv[2]) if len(sys.argv) > 2 else TARGET_MS
+    times = median_times(launches)
+    for name, ms in times.items():
+        print(f"{name:<16}{ms:>10.1f} ms")
+    ok = times['first_paint'] <= target
+    print(f"First paint {'within' if ok else 'OVER'} the {target:.0f} ms target")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+os.environ['THREE_CARD_LOG'] = ''
+os.environ['THREE_CARD_HISTORY'] = ''
+
+import bench_hand_table
+import bench_shoe
+import bench_startup
+import game_state
+import hand_table
+import table
+
+# Benchmark suite: hand evaluation, comparison, settlement, deck preparation, card
+# rendering and the window's time to first paint, run headless (Qt on the offscreen
+# platform). Each benchmark is timed a few times and the best run is kept. Results are
+# written as JSON and can be compared against a saved baseline; a benchmark more than
+# --threshold worse than the baseline is a regression and makes the run exit with
+# status 1.
+#
+#     python benchmarks/suite.py                        run, save results.json, compare with baseline.json
+#     python benchmarks/suite.py --save-baseline        run and make this the baseline
+#     python benchmarks/suite.py --only deck --repeat 5
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RESULTS_PATH = os.path.join(HERE, 'results.json')
+BASELINE_PATH = os.path.join(HERE, 'baseline.json')
+DEFAULT_THRESHOLD = 0.10
+
+BENCHMARKS = []
+
+
+def benchmark(name, unit, higher_is_better=True):
+    # Register a benchmark function returning one number in unit
+    def register(func):
+        BENCHMARKS.append((name, unit, higher_is_better, func))
+        return func
+    return register
+
+
+def per_second(func, count, *args):
+    start = time.perf_counter()
+    func(*args)
+    return count / (time.perf_counter() - start)
+
+
+@benchmark('evaluate_hand', 'hands/s')
+def evaluate_hand(size):
+    deals = bench_hand_table.random_hands(size)
+    dict_deals = [([hand_table.int_to_card(c) for c in player], []) for player, _ in deals]
+    return per_second(bench_hand_table.engine_evaluate, size, dict_deals)
+
+
+@benchmark('evaluate_hand_table', 'hands/s')
+def evaluate_hand_table(size):
+    return per_second(bench_hand_table.table_evaluate, size, bench_hand_table.random_hands(size))
+
+
+@benchmark('compare_hands', 'compares/s')
+def compare_hands(size):
+    deals = bench_hand_table.random_hands(size)
+    dict_deals = [([hand_table.int_to_card(c) for c in player], [hand_table.int_to_card(c) for c in dealer])
+                  for player, dealer in deals]
+    return per_second(bench_hand_table.engine_compare, size, dict_deals)
+
+
+@benchmark('compare_hands_table', 'compares/s')
+def compare_hands_table(size):
+    return per_second(bench_hand_table.table_compare, size, bench_hand_table.random_hands(size))
+
+
+@benchmark('settle_rounds', 'rounds/s')
+def settle_rounds(size):
+    # Whole one-seat rounds through the game's state machine: bet, deal, play, settle
+    rounds = size // 10
+    machine = game_state.GameStateMachine(balance=10 ** 12)
+
+    def run():
+        for _ in range(rounds):
+            machine.place_bet(10, 5)
+            machine.play()
+            machine.next_round()
+    return per_second(run, rounds)
+
+
+@benchmark('settle_table_rounds', 'seat rounds/s')
+def settle_table_rounds(size):
+    # Seven-seat table rounds, counted per seat
+    rounds = size // 70
+    full_table = table.Table(seats=table.MAX_SEATS, balance=10 ** 12)
+
+    def run():
+        for _ in range(rounds):
+            for seat in full_table.seats:
+                full_table.place_bet(seat, 10, 5)
+            full_table.deal()
+            for seat in full_table.seats:
+                full_table.play(seat)
+            full_table.settle()
+            full_table.finish_round()
+    return per_second(run, rounds * table.MAX_SEATS)
+
+
+@benchmark('simulate_rounds', 'rounds/s')
+def simulate_rounds(size):
+    import simulator  # needs NumPy
+    rounds = size * 10
+    simulator.simulate(rounds // 10, seed=0)  # warm up the strength tables
+    return per_second(simulator.simulate, rounds, rounds, 1, 0, None, 0)
+
+
+@benchmark('shuffled_deck', 'us/round', higher_is_better=False)
+def shuffled_deck(size):
+    return bench_shoe.cost(bench_shoe.fresh_deck_round, size // 10)
+
+
+@benchmark('shoe_round', 'us/round', higher_is_better=False)
+def shoe_round(size):
+    return bench_shoe.cost(bench_shoe.shoe_round('single'), size // 10)
+
+
+@benchmark('draw_cards', 'us/hand', higher_is_better=False)
+def draw_cards(size):
+    hands = size // 10
+    one_seat = table.Table()
+
+    def run():
+        for _ in range(hands):
+            one_seat.draw_cards()
+            one_seat.shoe.new_round()
+    return 1e6 / per_second(run, hands)
+
+
+_game = None
+
+
+def render_game():
+    # One offscreen game window for the rendering benchmarks, or None without PyQt5
+    global _game
+    if _game is None:
+        try:
+            from PyQt5.QtWidgets import QApplication
+        except ImportError:
+            return None
+        import Three_Card_QT
+        _game = (QApplication.instance() or QApplication([]), Three_Card_QT.ThreeCardPokerGame(threaded=False))
+    return _game[1]
+
+
+@benchmark('render_deal_cold', 'ms/deal', higher_is_better=False)
+def render_deal_cold(size):
+    import bench_card_images
+    game = render_game()
+    if game is None:
+        return None
+    times = bench_card_images.deal_times(game, max(5, size // 20000), cold=True)
+    return sorted(times)[len(times) // 2]
+
+
+@benchmark('render_deal_warm', 'ms/deal', higher_is_better=False)
+def render_deal_warm(size):
+    import bench_card_images
+    game = render_game()
+    if game is None:
+        return None
+    bench_card_images.fill_cache(game)
+    times = bench_card_images.deal_times(game, max(20, size // 2000), cold=False)
+    return sorted(times)[len(times) // 2]
+
+
+@benchmark('startup_first_paint', 'ms', higher_is_better=False)
+def startup_first_paint(size):
+    return bench_startup.median_times(3)['first_paint']
+
+
+def run(size=100000, repeat=3, only=None):
+    # Run the benchmarks whose name contains only (all by default), best of repeat runs each
+    results = {}
+    for name, unit, higher_is_better, func in BENCHMARKS:
+        if only and only not in name:
+            continue
+        values = [value for value in (func(size) for _ in range(repeat)) if value is not None]
+        if not values:
+            print(f"{name:<24}skipped")
+            continue
+        best = max(values) if higher_is_better else min(values)
+        results[name] = {'value': best, 'unit': unit, 'higher_is_better': higher_is_better}
+        print(f"{name:<24}{best:>16,.3f} {unit}")
+    return {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'size': size,
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    # Change of each benchmark against the baseline (positive is better) and the names that regressed
+    changes = {}
+    regressions = []
+    for name, result in current['results'].items():
+        if name not in baseline['results']:
+            continue
+        before = baseline['results'][name]['value']
+        after = result['value']
+        change = (after - before) / before if result['higher_is_better'] else (before - after) / before
+        changes[name] = change
+        if change < -threshold:
+            regressions.append(name)
+    return changes, regressions
+
+
+def save(results, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+
+
+def load(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Three Card Poker benchmark suite")
+    parser.add_argument('--size', type=int, default=100000, help="work per benchmark, in hands")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per benchmark, the best is kept")
+    parser.add_argument('--only', help="run only benchmarks whose name contains this")
+    parser.add_argument('--output', default=RESULTS_PATH, help="where to write the results JSON")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="baseline JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="fraction a benchmark may be worse than the baseline")
+    parser.add_argument('--save-baseline', action='store_true', help="also save the results as the baseline")
+    args = parser.parse_args()
+    args.output = os.path.abspath(args.output)
+    args.baseline = os.path.abspath(args.baseline)
+    os.chdir(ROOT)  # the game loads its card images relative to the repository root
+
+    results = run(args.size, args.repeat, args.only)
+    save(results, args.output)
+    if args.save_baseline:
+        save(results, args.baseline)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    changes, regressions = compare(results, load(args.baseline), args.threshold)
+    print(f"\nAgainst {args.baseline} (threshold {args.threshold:.0%}):")
+    for name, change in changes.items():
+        print(f"{name:<24}{change:>+9.1%}{'  REGRESSION' if name in regressions else ''}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
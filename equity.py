@@ -0,0 +1,144 @@
+import sys
+
+import numpy as np
+
+import hand_table
+import house_edge
+import poker_engine
+import profiles
+
+# Exact value of playing or folding one dealt hand, from one deck.
+#
+# After the player's three cards the other 49 give 18,424 dealer hands. hand_equity
+# keeps every hand sorted by strength with a mask per card of the hands holding it, so
+# the dealer hands are three ORed masks, and those that don't qualify, lose, tie or
+# win are counted in slices found by binary search. equity_chart gives the same
+# figures for every hand at once from house_edge.dealer_counts, for a full strategy
+# chart.
+#
+# Values are per unit of Ante, with pair_plus units of Pair Plus alongside it: play
+# settles the Ante, Play and Pair Plus bets, fold loses the Ante and Pair Plus.
+
+SUIT_LETTERS = dict(zip('hdcs', poker_engine.SUITS))
+
+_hand_cards = None
+_strengths = None
+_sorted_strengths = None
+_holding = None
+
+
+def _tables():
+    # Cards and strengths of every hand by hand_table index, built on first use
+    global _hand_cards, _strengths
+    if _hand_cards is None:
+        _hand_cards = house_edge.hand_cards()
+        _strengths = np.frombuffer(hand_table.STRENGTHS, dtype=np.int32)
+    return _hand_cards, _strengths
+
+
+def _sorted_tables():
+    # Strengths in ascending order and, for each card, which of those hands hold it
+    global _sorted_strengths, _holding
+    if _holding is None:
+        hand_cards, strengths = _tables()
+        order = np.argsort(strengths, kind='stable')
+        holding = np.zeros((hand_table.NUM_CARDS, hand_table.NUM_HANDS), dtype=bool)
+        for column in hand_cards[order].T:
+            holding[column, np.arange(hand_table.NUM_HANDS)] = True
+        _sorted_strengths, _holding = strengths[order], holding
+    return _sorted_strengths, _holding
+
+
+def _values(counts, categories, rules, pair_plus):
+    # Probabilities and Play/Fold values from dealer hand counts (arrays or numbers)
+    win_amount = (np.array(rules.ante_payout) + np.array(rules.play_payout))[categories]
+    ante_play = (counts['not_qualified'] + counts['player_wins'] * win_amount - counts['ties']
+                 - 2 * counts['dealer_wins']) / house_edge.DEALER_HANDS + np.array(rules.ante_bonus)[categories]
+    play_ev = ante_play + pair_plus * (np.array(rules.pair_plus_payout, dtype=np.float64)[categories] - 1)
+    fold_ev = -1.0 - pair_plus
+    return {
+        'dealer_qualifies': 1 - counts['not_qualified'] / house_edge.DEALER_HANDS,
+        'not_qualified': counts['not_qualified'] / house_edge.DEALER_HANDS,
+        'player_wins': counts['player_wins'] / house_edge.DEALER_HANDS,
+        'ties': counts['ties'] / house_edge.DEALER_HANDS,
+        'dealer_wins': counts['dealer_wins'] / house_edge.DEALER_HANDS,
+        'play_ev': play_ev,
+        'fold_ev': fold_ev,
+        'play': play_ev >= fold_ev,
+    }
+
+
+def hand_equity(cards, rules=None, pair_plus=0.0):
+    # Exact Play and Fold values of three distinct cards (card dicts or ints) against
+    # every dealer hand left in the deck. rules is anything profiles.get accepts.
+    rules = profiles.get(rules)
+    cards = [hand_table.card_to_int(card) if isinstance(card, dict) else card for card in cards]
+    if len(set(cards)) != 3:
+        raise ValueError("Exact equity needs three different cards from one deck")
+    sorted_strengths, holding = _sorted_tables()
+    a, b, c = cards
+    strength = hand_table.strength(a, b, c)
+    held = holding[a] | holding[b] | holding[c]
+
+    # Slices of the sorted hands: not qualified, qualified and weaker, equal, stronger
+    qualify = int(np.searchsorted(sorted_strengths, rules.qualify_strength))
+    below = max(qualify, int(np.searchsorted(sorted_strengths, strength)))
+    at_or_below = max(qualify, int(np.searchsorted(sorted_strengths, strength, 'right')))
+    not_qualified = qualify - int(np.count_nonzero(held[:qualify]))
+    player_wins = below - qualify - int(np.count_nonzero(held[qualify:below]))
+    ties = at_or_below - below - int(np.count_nonzero(held[below:at_or_below]))
+    counts = {'not_qualified': not_qualified, 'player_wins': player_wins, 'ties': ties,
+              'dealer_wins': house_edge.DEALER_HANDS - not_qualified - player_wins - ties}
+    result = _values(counts, strength >> 12, rules, pair_plus)
+    result['play_ev'] = float(result['play_ev'])
+    result['play'] = bool(result['play'])
+    result['strength'] = strength
+    return result
+
+
+def equity_chart(rules=None, pair_plus=0.0):
+    # hand_equity of all 22,100 hands as arrays by hand_table index
+    rules = profiles.get(rules)
+    _, strengths = _tables()
+    result = _values(house_edge.dealer_counts(rules.qualify_strength), strengths >> 12, rules, pair_plus)
+    result['strength'] = strengths
+    return result
+
+
+def chart_rows(chart):
+    # One row per hand type and ranks, suits aside: (name, ranks, lowest and highest
+    # Play value over the suits, share of the suits that are played), strongest first
+    hand_cards, strengths = _tables()
+    groups = {}
+    for index in np.argsort(-strengths, kind='stable'):
+        ranks = tuple(sorted((card >> 2 for card in hand_cards[index]), reverse=True))
+        groups.setdefault((int(strengths[index]) >> 12, ranks), []).append(index)
+    rows = []
+    for (category, ranks), indices in groups.items():
+        play_ev = chart['play_ev'][indices]
+        rows.append((hand_table.CATEGORY_NAMES[category], '-'.join(poker_engine.RANKS[rank] for rank in ranks),
+                     float(play_ev.min()), float(play_ev.max()), float(chart['play'][indices].mean())))
+    return rows
+
+
+def parse_card(text):
+    # 'Qh', '10s' or 'As' as a card dict
+    rank, suit = text[:-1].upper(), text[-1].lower()
+    if rank not in poker_engine.RANK_ORDER or suit not in SUIT_LETTERS:
+        raise ValueError(f"Unknown card {text!r}, expected a rank and one of h, d, c, s like Qh or 10s")
+    return {'rank': rank, 'suit': SUIT_LETTERS[suit]}
+
+
+if __name__ == "__main__":
+    # python equity.py Qh 6d 4c   -- one hand
+    # python equity.py            -- the High Card hands close to the play/fold line
+    if len(sys.argv) == 4:
+        equity = hand_equity([parse_card(text) for text in sys.argv[1:]])
+        print(f"Dealer qualifies {equity['dealer_qualifies']:.4%}, player wins {equity['player_wins']:.4%}, "
+              f"ties {equity['ties']:.4%}, dealer wins {equity['dealer_wins']:.4%}")
+        print(f"Play {equity['play_ev']:+.5f}, Fold {equity['fold_ev']:+.5f}: "
+              f"{'play' if equity['play'] else 'fold'}")
+    else:
+        for name, ranks, low, high, played in chart_rows(equity_chart()):
+            if name == "High Card" and -1.15 < high and low < -0.85:
+                print(f"{name:<12}{ranks:<10}{low:+9.5f} to {high:+9.5f}  plays {played:.0%} of suits")
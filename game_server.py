@@ -0,0 +1,142 @@
+import asyncio
+import json
+import sys
+
+import game_state
+import session_stats
+
+# asyncio server hosting one table per connection, each running a
+# game_state.GameStateMachine like the game window. The protocol is one JSON object
+# per line in each direction:
+#
+#     {"action": "bet", "ante": 10, "pair_plus": 5}   place_bet, answers with the dealt hand
+#     {"action": "rebet"}                             quick_bet, same bets as last round
+#     {"action": "play"} / {"action": "fold"}         settle the round
+#     {"action": "state"}                             balance and phase
+#     {"action": "stats"}                             session_stats summary of this table
+#     {"action": "server_stats"}                      the same over every table that has closed
+#
+# Every answer has "ok"; failed requests carry "error" with the message the window
+# would show. When the balance drops below poker_engine.MIN_BALANCE the answer has
+# "game_over": true and the server closes the connection.
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+BACKLOG = 4096
+
+# Stats of every table that has closed, each merged in when its connection ends
+SERVER_STATS = session_stats.SessionStats()
+
+
+def card_json(cards):
+    # Cards as rank/suit objects, the same dicts the game uses
+    return [{'rank': card['rank'], 'suit': card['suit']} for card in cards]
+
+
+class Session:
+    # One connection's game, kept small so one process can hold thousands
+    __slots__ = ('machine', 'stats')
+
+    def __init__(self, balance=1000):
+        self.machine = game_state.GameStateMachine(balance)
+        self.stats = session_stats.SessionStats()
+
+    @property
+    def over(self):
+        return self.machine.phase == game_state.GAME_OVER
+
+    def handle(self, request):
+        # Answer one request
+        machine = self.machine
+        action = request.get('action')
+        try:
+            if action == 'state':
+                return {'ok': True, 'phase': machine.phase, 'round': machine.game_round,
+                        'balance': machine.seat.balance}
+            if action == 'stats':
+                return {'ok': True, 'stats': self.stats.summary()}
+            if action == 'server_stats':
+                return {'ok': True, 'stats': SERVER_STATS.summary()}
+            if action == 'bet':
+                return dealt_json(machine.place_bet(request.get('ante'), request.get('pair_plus', 0)))
+            if action == 'rebet':
+                return dealt_json(machine.rebet())
+            if action == 'play':
+                state = machine.play()
+            elif action == 'fold':
+                state = machine.fold()
+            else:
+                return error(f"Unknown action {action!r}")
+        except ValueError as e:
+            return error(str(e))
+        self.stats.add_state(state)
+        machine.next_round()
+        return settled_json(state)
+
+
+def dealt_json(state):
+    return {'ok': True, 'round': state.round, 'hand': card_json(state.player_hand), 'balance': state.balance}
+
+
+def settled_json(state):
+    ante_winnings, pair_plus_winnings, play_winnings = state.winnings
+    return {
+        'ok': True,
+        'round': state.round,
+        'result': state.result,
+        'dealer_qualified': state.dealer_qualified,
+        'dealer': card_json(state.dealer_hand),
+        'winnings': {'ante': ante_winnings, 'pair_plus': pair_plus_winnings, 'play': play_winnings},
+        'profited': state.profited,
+        'balance': state.balance,
+        'game_over': state.game_over,
+    }
+
+
+def error(message):
+    return {'ok': False, 'error': message}
+
+
+async def handle_connection(reader, writer):
+    # Run one session until the client disconnects or the game is over
+    session = Session()
+    try:
+        while not session.over:
+            try:
+                line = await reader.readline()
+                if not line:
+                    break
+                request = json.loads(line)
+            except ValueError:
+                # Not JSON, not UTF-8, or a line over the stream limit (which readline drops)
+                response = error("Invalid JSON")
+            else:
+                response = session.handle(request) if isinstance(request, dict) else error("Expected a JSON object")
+            writer.write(json.dumps(response, ensure_ascii=False, separators=(',', ':')).encode() + b'\n')
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        SERVER_STATS.merge(session.stats)
+        writer.close()
+
+
+async def start_server(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    # Start listening; port 0 picks a free port
+    return await asyncio.start_server(handle_connection, host, port, backlog=BACKLOG)
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    server = await start_server(host, port)
+    print(f"Serving Three Card Poker on {host}:{server.sockets[0].getsockname()[1]}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    # python game_server.py [port] [host]
+    try:
+        asyncio.run(serve(sys.argv[2] if len(sys.argv) > 2 else DEFAULT_HOST,
+                          int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PORT))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,105 @@
+import poker_engine
+import table
+
+# The rules of one player's game as a state machine, with no UI in it:
+#
+#     betting --place_bet/rebet--> dealt --play/fold--> settled --next_round--> betting
+#
+# and game_over instead of betting once the balance is below poker_engine.MIN_BALANCE.
+# Each transition returns a new RoundState snapshot, so a UI (or a network session)
+# only ever observes finished states and never the table while it changes.
+# Invalid actions raise ValueError with the message to show the player.
+
+BETTING = 'betting'
+DEALT = 'dealt'
+SETTLED = 'settled'
+GAME_OVER = 'game_over'
+
+
+class RoundState:
+    __slots__ = ('round', 'phase', 'player_hand', 'dealer_hand', 'ante_bet', 'pair_plus_bet', 'play_bet',
+                 'result', 'dealer_qualified', 'winnings', 'profited', 'balance', 'game_over')
+
+    def __init__(self, round, phase, player_hand, dealer_hand, ante_bet, pair_plus_bet, play_bet, result,
+                 dealer_qualified, winnings, profited, balance, game_over):
+        self.round = round
+        self.phase = phase
+        self.player_hand = player_hand
+        self.dealer_hand = dealer_hand
+        self.ante_bet = ante_bet
+        self.pair_plus_bet = pair_plus_bet
+        self.play_bet = play_bet
+        self.result = result
+        self.dealer_qualified = dealer_qualified
+        self.winnings = winnings
+        self.profited = profited
+        self.balance = balance
+        self.game_over = game_over
+
+
+class GameStateMachine:
+    __slots__ = ('table', 'seat', 'phase', 'game_round', 'last_ante_bet', 'last_pair_plus_bet')
+
+    def __init__(self, balance=1000, shoe=None, rules=None):
+        self.table = table.Table(seats=1, balance=balance, rules=rules, shoe=shoe)
+        self.seat = self.table.seats[0]
+        self.phase = BETTING
+        self.game_round = 1
+        self.last_ante_bet = 0
+        self.last_pair_plus_bet = 0
+
+    def snapshot(self):
+        # The current round as a RoundState
+        seat = self.seat
+        return RoundState(self.game_round, self.phase, list(seat.hand), list(self.table.dealer_hand), seat.ante_bet,
+                          seat.pair_plus_bet, seat.play_bet, seat.result, seat.dealer_qualified, seat.winnings,
+                          seat.profited, seat.balance, seat.balance < poker_engine.MIN_BALANCE)
+
+    def _expect(self, phase, message):
+        if self.phase != phase:
+            raise ValueError(message)
+
+    def place_bet(self, ante_bet, pair_plus_bet):
+        # Take the bets and deal the player's hand
+        self._expect(BETTING, "Finish the current round first!")
+        ante_min, ante_max = poker_engine.ANTE_LIMITS
+        pair_plus_min, pair_plus_max = poker_engine.PAIR_PLUS_LIMITS
+        if type(ante_bet) is not int or not ante_min <= ante_bet <= ante_max:
+            raise ValueError(f"Ante bet must be between ${ante_min} and ${ante_max}!")
+        if type(pair_plus_bet) is not int or not pair_plus_min <= pair_plus_bet <= pair_plus_max:
+            raise ValueError(f"Pair Plus bet must be between ${pair_plus_min} and ${pair_plus_max}!")
+        self.table.place_bet(self.seat, ante_bet, pair_plus_bet)
+        self.table.deal()
+        self.last_ante_bet = ante_bet
+        self.last_pair_plus_bet = pair_plus_bet
+        self.phase = DEALT
+        return self.snapshot()
+
+    def rebet(self):
+        # Same bets as the last round
+        if not self.last_ante_bet:
+            raise ValueError("No previous bet to repeat!")
+        return self.place_bet(self.last_ante_bet, self.last_pair_plus_bet)
+
+    def play(self):
+        # Place the Play bet and settle against the dealer
+        self._expect(DEALT, "Place a bet first!")
+        self.table.play(self.seat)
+        self.table.settle()
+        self.phase = SETTLED
+        return self.snapshot()
+
+    def fold(self):
+        # Give up the round
+        self._expect(DEALT, "Place a bet first!")
+        self.table.fold(self.seat)
+        self.phase = SETTLED
+        return self.snapshot()
+
+    def next_round(self):
+        # Clear the bets and get the shoe ready after a settled round
+        self._expect(SETTLED, "The round is not settled yet!")
+        self.table.finish_round()
+        self.game_round += 1
+        self.phase = GAME_OVER if self.seat.balance < poker_engine.MIN_BALANCE else BETTING
+        return self.snapshot()
@@ -0,0 +1,152 @@
+import os
+import struct
+import sys
+
+import hand_table
+
+try:
+    import numpy as np
+except ImportError:  # the game only appends, which needs no NumPy
+    np = None
+
+# Fixed-width binary hand history.
+#
+# The file starts with an 8-byte header (magic, version, record size) followed by
+# 32-byte little-endian records, one per round:
+#
+#     cards             6 x uint8   player then dealer, card ints of hand_table, 255 = not dealt
+#     result            uint8       index into RESULTS
+#     dealer_qualified  uint8
+#     ante, pair_plus, play   3 x uint32
+#     profit            int32
+#     balance           int64
+#
+# The game appends records with struct. Analysis memory-maps the file as a NumPy
+# structured array, so millions of rounds are read without copying or parsing.
+
+MAGIC = b'TCPH'
+VERSION = 1
+HEADER = struct.Struct('<4sHH')
+RECORD = struct.Struct('<6sBBIIIiq')
+NO_CARD = 255
+
+RESULTS = ["Player", "Dealer", "Tie", "Fold"]
+
+if np is not None:
+    RECORD_DTYPE = np.dtype([
+        ('cards', 'u1', 6),
+        ('result', 'u1'),
+        ('dealer_qualified', 'u1'),
+        ('ante', '<u4'),
+        ('pair_plus', '<u4'),
+        ('play', '<u4'),
+        ('profit', '<i4'),
+        ('balance', '<i8'),
+    ])
+    _C2 = np.array([n * (n - 1) // 2 for n in range(hand_table.NUM_CARDS)], dtype=np.int32)
+    _C3 = np.array([n * (n - 1) * (n - 2) // 6 for n in range(hand_table.NUM_CARDS)], dtype=np.int32)
+
+
+class HandHistoryWriter:
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'ab')
+        if self._file.tell() == 0:
+            # Written out at once, so a session killed before its first round leaves a valid file
+            self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+            self._file.flush()
+
+    def append(self, player_cards, dealer_cards, result, dealer_qualified, ante, pair_plus, play, profit, balance):
+        # Append one round; cards are card ints, dealer_cards is empty for a fold
+        cards = bytes(player_cards) + bytes(dealer_cards) + bytes([NO_CARD]) * (6 - len(player_cards) - len(dealer_cards))
+        self._file.write(RECORD.pack(cards, RESULTS.index(result), dealer_qualified, ante, pair_plus, play,
+                                     profit, balance))
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def read_header(path):
+    # Check the header and return the number of records in the file
+    with open(path, 'rb') as f:
+        header = f.read(HEADER.size)
+    if len(header) != HEADER.size:
+        raise ValueError(f"{path} is not a version {VERSION} hand history file")
+    magic, version, record_size = HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+        raise ValueError(f"{path} is not a version {VERSION} hand history file")
+    return (os.path.getsize(path) - HEADER.size) // RECORD.size
+
+
+def load(path):
+    # Memory-map the records as a read-only structured array
+    count = read_header(path)
+    if count == 0:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=HEADER.size, shape=(count,))
+
+
+def write_records(path, records):
+    # Append a structured array of RECORD_DTYPE records in one write
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+    else:
+        read_header(path)
+    with open(path, 'ab') as f:
+        np.ascontiguousarray(records, dtype=RECORD_DTYPE).tofile(f)
+
+
+def player_categories(history):
+    # Hand category (1-6) of the player's hand in each round
+    hands = np.sort(history['cards'][:, :3].astype(np.int32), axis=1)
+    indices = hands[:, 0] + _C2[hands[:, 1]] + _C3[hands[:, 2]]
+    # Hands with a repeated card, from a multi-deck shoe; the middle card is the repeated one
+    repeated = (hands[:, 0] == hands[:, 1]) | (hands[:, 1] == hands[:, 2])
+    indices[repeated] = 0
+    categories = np.frombuffer(hand_table.STRENGTHS, dtype=np.int32)[indices] >> 12
+    if repeated.any():
+        pair = hands[repeated, 1]
+        other = np.where(hands[repeated, 0] == pair, hands[repeated, 2], hands[repeated, 0])
+        repeated_strengths = np.frombuffer(hand_table.repeated_strengths(), dtype=np.int32)
+        categories[repeated] = repeated_strengths[pair * hand_table.NUM_CARDS + other] >> 12
+    return categories
+
+
+def win_rate_by_category(history):
+    # Rounds and player win rate for each player hand category
+    categories = player_categories(history)
+    wins = history['result'] == RESULTS.index("Player")
+    rounds = np.bincount(categories, minlength=len(hand_table.CATEGORY_NAMES))
+    won = np.bincount(categories, weights=wins, minlength=len(hand_table.CATEGORY_NAMES))
+    return {name: (int(rounds[i]), float(won[i] / rounds[i]) if rounds[i] else 0.0)
+            for i, name in enumerate(hand_table.CATEGORY_NAMES) if name}
+
+
+def pair_plus_hit_frequency(history):
+    # Share of played rounds with a Pair Plus bet that were paid (a Pair or better)
+    categories = player_categories(history)
+    bet = (history['pair_plus'] > 0) & (history['result'] != RESULTS.index("Fold"))
+    if not bet.any():
+        return 0.0
+    return float((categories[bet] >= 2).mean())
+
+
+def bankroll_curve(history):
+    # Balance after each round, a view on the mapped file
+    return history['balance']
+
+
+if __name__ == "__main__":
+    # python hand_history.py game.hist
+    history = load(sys.argv[1] if len(sys.argv) > 1 else 'game.hist')
+    print(f"{len(history):,} rounds")
+    for name, (rounds, win_rate) in win_rate_by_category(history).items():
+        print(f"  {name:<16}{rounds:>10,}  win rate {win_rate:.4f}")
+    print(f"Pair Plus hit frequency: {pair_plus_hit_frequency(history):.4f}")
+    if len(history):
+        curve = bankroll_curve(history)
+        print(f"Balance: final {curve[-1]:,}, low {curve.min():,}, high {curve.max():,}")
@@ -0,0 +1,162 @@
+import os
+import sys
+from array import array
+from itertools import combinations
+
+import poker_engine
+
+# Integer card encoding and a precomputed strength table for all C(52,3) = 22,100 hands.
+#
+# A card is rank_index * 4 + suit_index (0-51), following the order of
+# poker_engine.RANKS and poker_engine.SUITS. A hand of three distinct cards maps to
+# its combination index (0-22099), and STRENGTHS[index] is a single integer that is
+# totally ordered the same way as poker_engine.compare_hands:
+#
+#     strength = category << 12 | k0 << 8 | k1 << 4 | k2
+#
+# where category is 1 (High Card) to 6 (Straight Flush) and k0-k2 are the rank
+# values (2-14) compare_hands breaks ties on. For a pair they are pair, pair, kicker.
+#
+# Hands from a multi-deck shoe can hold the same card twice (or three times). They
+# are all a Pair or better and have their own small table of 52 * 52 strengths,
+# indexed by repeated_index and built the first time one is looked up.
+
+NUM_CARDS = 52
+NUM_HANDS = 22100
+NUM_REPEATED_HANDS = NUM_CARDS * NUM_CARDS
+
+CATEGORY_NAMES = [None, "High Card", "Pair", "Flush", "Straight", "Three of a Kind", "Straight Flush"]
+
+# Dealer qualifies with Queen high or better
+DEALER_QUALIFY_STRENGTH = 1 << 12 | 12 << 8
+
+CACHE_PATH = os.environ.get(
+    'THREE_CARD_TABLE', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'hand_table.bin'))
+
+# Binomial coefficients C(n, 2) and C(n, 3) for the combination index
+_C2 = [n * (n - 1) // 2 for n in range(NUM_CARDS)]
+_C3 = [n * (n - 1) * (n - 2) // 6 for n in range(NUM_CARDS)]
+
+
+def card_to_int(card):
+    # Encode a {'rank', 'suit'} card as 0-51
+    return poker_engine.RANKS.index(card['rank']) * 4 + poker_engine.SUITS.index(card['suit'])
+
+
+def int_to_card(card):
+    # Decode 0-51 back to a {'rank', 'suit'} card
+    return {'rank': poker_engine.RANKS[card >> 2], 'suit': poker_engine.SUITS[card & 3]}
+
+
+def encode_hand(cards):
+    # Encode a list of three card dicts as a tuple of ints
+    return tuple(card_to_int(card) for card in cards)
+
+
+def hand_index(a, b, c):
+    # Combination index of three distinct cards, in any order
+    if a > b:
+        a, b = b, a
+    if b > c:
+        b, c = c, b
+    if a > b:
+        a, b = b, a
+    return a + _C2[b] + _C3[c]
+
+
+def repeated_index(a, b, c):
+    # Index of a hand with a repeated card: repeated card * 52 + the other card
+    if a == b or a == c:
+        return a * NUM_CARDS + (c if a == b else b)
+    return b * NUM_CARDS + a
+
+
+def _strength_of(cards):
+    # Strength integer for one hand, using the reference evaluator
+    category = poker_engine.hand_strength(cards)
+    values = sorted((poker_engine.RANK_ORDER[card['rank']] for card in cards), reverse=True)
+    if category == 2:  # Pair
+        pair = values[1]
+        kicker = values[0] if values[0] != pair else values[2]
+        values = [pair, pair, kicker]
+    return category << 12 | values[0] << 8 | values[1] << 4 | values[2]
+
+
+def build_table():
+    # Evaluate every hand once with poker_engine
+    table = array('i', bytes(4 * NUM_HANDS))
+    for a, b, c in combinations(range(NUM_CARDS), 3):
+        table[hand_index(a, b, c)] = _strength_of([int_to_card(a), int_to_card(b), int_to_card(c)])
+    return table
+
+
+def save_table(table, path=CACHE_PATH):
+    # Write the table to a cache file
+    with open(path, 'wb') as f:
+        table.tofile(f)
+
+
+def load_table(path=CACHE_PATH):
+    # Load the table from the cache file, or build it and try to cache it if the file
+    # is missing or stale, so only the first run pays for building it
+    table = array('i')
+    try:
+        with open(path, 'rb') as f:
+            table.fromfile(f, NUM_HANDS)
+            complete = f.read(1) == b''
+        if complete and table[NUM_HANDS - 1] == _strength_of([int_to_card(c) for c in (49, 50, 51)]):
+            return table
+    except (OSError, EOFError):
+        pass
+    table = build_table()
+    try:
+        save_table(table, path)
+    except OSError:
+        pass
+    return table
+
+
+STRENGTHS = load_table()
+
+_repeated_strengths = None
+
+
+def repeated_strengths():
+    # Strength of every hand with a repeated card, built once
+    global _repeated_strengths
+    if _repeated_strengths is None:
+        table = array('i', bytes(4 * NUM_REPEATED_HANDS))
+        for repeated in range(NUM_CARDS):
+            for other in range(NUM_CARDS):
+                table[repeated * NUM_CARDS + other] = _strength_of(
+                    [int_to_card(repeated), int_to_card(repeated), int_to_card(other)])
+        _repeated_strengths = table
+    return _repeated_strengths
+
+
+def strength(a, b, c):
+    # Strength of a hand given as three card ints
+    if a == b or b == c or a == c:
+        return repeated_strengths()[repeated_index(a, b, c)]
+    return STRENGTHS[hand_index(a, b, c)]
+
+
+def category(hand_strength):
+    # Hand type name for a strength integer
+    return CATEGORY_NAMES[hand_strength >> 12]
+
+
+def compare(player, dealer):
+    # Compare two hands given as card int tuples, same result as poker_engine.compare_hands
+    player_strength = strength(*player)
+    dealer_strength = strength(*dealer)
+    if player_strength > dealer_strength:
+        return "Player"
+    elif player_strength < dealer_strength:
+        return "Dealer"
+    return "Tie"
+
+
+if __name__ == "__main__":
+    # python hand_table.py [path] -- build and cache the table
+    save_table(build_table(), sys.argv[1] if len(sys.argv) > 1 else CACHE_PATH)
@@ -0,0 +1,148 @@
+import sys
+from itertools import combinations
+
+import numpy as np
+
+import hand_table
+import profiles
+
+# Exact house edge by enumerating every player hand against every dealer hand
+# that can be dealt from the remaining 49 cards (22,100 x 18,424 matchups).
+#
+# Settlement follows profiles.Rules.settle, per unit of Ante:
+#   dealer not qualified   Ante wins 1, Play is returned                +1
+#   player wins            Ante wins ante_payout, Play wins play_payout
+#   tie                    Ante is returned, Play is lost               -1
+#   dealer wins            Ante and Play are lost                       -2
+#   fold                   Ante (and Pair Plus) are lost                -1
+# plus ante_bonus on every played hand. Pair Plus returns pair_plus_payout times the
+# bet when the hand is played, so its net is pair_plus_payout - 1 per unit.
+#
+# Instead of comparing each pair of hands, the dealer hands that beat, tie or lose
+# to a player hand are counted with binary searches over sorted strengths, and the
+# hands that share a card with the player are removed by inclusion-exclusion.
+
+DEALER_HANDS = 18424
+
+
+def hand_cards():
+    # (22100, 3) array of the cards in each hand, by hand_table index
+    cards = np.empty((hand_table.NUM_HANDS, 3), dtype=np.int8)
+    for hand in combinations(range(hand_table.NUM_CARDS), 3):
+        cards[hand_table.hand_index(*hand)] = hand
+    return cards
+
+
+def _count_below(sorted_strengths, strengths, side):
+    # Number of entries below each strength (or at or below, for side='right')
+    return np.searchsorted(sorted_strengths, strengths, side=side).astype(np.int64)
+
+
+def dealer_counts(qualify_strength=hand_table.DEALER_QUALIFY_STRENGTH):
+    # For every player hand, count the disjoint dealer hands that do not qualify,
+    # qualify and lose, qualify and tie, and qualify and win
+    cards = hand_cards()
+    strengths = np.frombuffer(hand_table.STRENGTHS, dtype=np.int32).astype(np.int64)
+    qualified = strengths >= qualify_strength
+
+    def counts(subset, players):
+        # Not-qualified, below and at-or-below counts of the hands in subset, for each player hand
+        dealer_strengths = np.sort(strengths[subset][qualified[subset]])
+        player_strengths = strengths[players]
+        return (np.count_nonzero(~qualified[subset]),
+                _count_below(dealer_strengths, player_strengths, 'left'),
+                _count_below(dealer_strengths, player_strengths, 'right'))
+
+    everyone = np.arange(hand_table.NUM_HANDS)
+    not_qualified, below, at_or_below = counts(everyone, everyone)
+    not_qualified = np.full(hand_table.NUM_HANDS, not_qualified, dtype=np.int64)
+
+    # Remove dealer hands sharing one card with the player
+    for card in range(hand_table.NUM_CARDS):
+        with_card = np.flatnonzero((cards == card).any(axis=1))
+        nq, lt, le = counts(with_card, with_card)
+        not_qualified[with_card] -= nq
+        below[with_card] -= lt
+        at_or_below[with_card] -= le
+
+    # Add back the ones sharing two cards, which were removed twice
+    for first, second in combinations(range(hand_table.NUM_CARDS), 2):
+        with_both = np.flatnonzero((cards == first).any(axis=1) & (cards == second).any(axis=1))
+        nq, lt, le = counts(with_both, with_both)
+        not_qualified[with_both] += nq
+        below[with_both] += lt
+        at_or_below[with_both] += le
+
+    # Remove the player's own hand
+    not_qualified -= ~qualified
+    at_or_below -= qualified
+
+    qualified_total = DEALER_HANDS - not_qualified
+    return {
+        'not_qualified': not_qualified,
+        'player_wins': below,
+        'ties': at_or_below - below,
+        'dealer_wins': qualified_total - at_or_below,
+    }
+
+
+def analyze(rules=None, pair_plus=0.0):
+    # Exact returns per unit Ante for a rules profile (anything profiles.get accepts),
+    # with pair_plus units of Pair Plus bet alongside the Ante (Pair Plus is lost on a
+    # fold, so it affects the decision)
+    rules = profiles.get(rules)
+    counts = dealer_counts(rules.qualify_strength)
+    strengths = np.frombuffer(hand_table.STRENGTHS, dtype=np.int32)
+    categories = strengths >> 12
+
+    win_amount = (np.array(rules.ante_payout) + np.array(rules.play_payout))[categories]
+    play_ev = (counts['not_qualified'] + counts['player_wins'] * win_amount
+               - counts['ties'] - 2 * counts['dealer_wins']) / DEALER_HANDS + np.array(rules.ante_bonus)[categories]
+    pair_plus_ev = np.array(rules.pair_plus_payout, dtype=np.float64)[categories] - 1
+
+    play = play_ev + pair_plus * pair_plus_ev >= -1 - pair_plus
+    ante_ev = np.where(play, play_ev, -1.0)
+    total_ev = ante_ev + pair_plus * np.where(play, pair_plus_ev, -1.0)
+    ante_return = ante_ev.mean()
+    pair_plus_return = pair_plus_ev.mean()
+
+    return {
+        'ante_return': ante_return,
+        'ante_edge': -ante_return,
+        'pair_plus_return': pair_plus_return,
+        'pair_plus_edge': -pair_plus_return,
+        'total_return': total_ev.mean(),
+        'play_frequency': play.mean(),
+        'play': play,
+        'play_ev': play_ev,
+        'fold_ev': np.full(hand_table.NUM_HANDS, -1.0),
+        'counts': counts,
+    }
+
+
+def weakest_playable(play):
+    # Weakest hand the decision table plays, as card dicts
+    strengths = np.frombuffer(hand_table.STRENGTHS, dtype=np.int32)
+    playable = np.flatnonzero(play)
+    if playable.size == 0:
+        return None
+    index = playable[np.argmin(strengths[playable])]
+    return [hand_table.int_to_card(int(card)) for card in hand_cards()[index]]
+
+
+def report(result):
+    # Format the main figures of an analyze() result
+    weakest = weakest_playable(result['play'])
+    weakest = ', '.join(f"{card['rank']}{card['suit']}" for card in weakest) if weakest else "never play"
+    return "\n".join([
+        f"Ante/Play return per unit Ante: {result['ante_return']:+.6f} (house edge {result['ante_edge']:.4%})",
+        f"Pair Plus return per unit:      {result['pair_plus_return']:+.6f} (house edge {result['pair_plus_edge']:.4%})",
+        f"Play frequency:                 {result['play_frequency']:.4%}",
+        f"Weakest hand played:            {weakest}",
+    ])
+
+
+if __name__ == "__main__":
+    # python house_edge.py [pair plus units per unit ante] [rules profile]
+    print(report(analyze(sys.argv[2] if len(sys.argv) > 2 else None,
+                         pair_plus=float(sys.argv[1]) if len(sys.argv) > 1 else 0.0)))
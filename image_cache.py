@@ -0,0 +1,51 @@
+import os
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage, QPixmap
+
+# Small copies of the game's images, made the first time each one is needed.
+#
+# The card art is about 1415 x 1920 pixels and the background 1952 x 1080, but the
+# window shows the cards at 100 x 150 and the background unscaled in a 600 x 900
+# window. Decoding the full images is most of the cost of opening the window and of
+# showing a card for the first time, so the part that is shown is saved once as a
+# small PNG under CACHE_DIR and later runs read that instead. A copy is made again
+# when its image is newer. If the directory can't be written the copy is only kept
+# in memory.
+
+CACHE_DIR = os.environ.get(
+    'THREE_CARD_IMAGE_CACHE', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'image_cache'))
+
+
+def cache_path(path, kind, size):
+    # Where the copy of an image is kept, e.g. image_cache/cards_clubs_..._scaled_100x150.png
+    name = os.path.splitext(os.path.normpath(path))[0].replace(os.sep, '_').lstrip('._')
+    return os.path.join(CACHE_DIR, f"{name}_{kind}_{size.width()}x{size.height()}.png")
+
+
+def _cached(path, kind, size, make):
+    cached = cache_path(path, kind, size)
+    try:
+        if os.path.getmtime(cached) >= os.path.getmtime(path):
+            pixmap = QPixmap(cached)
+            if not pixmap.isNull():
+                return pixmap
+    except OSError:
+        pass
+    image = make(QImage(path))
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        image.save(cached)
+    except OSError:
+        pass
+    return QPixmap.fromImage(image)
+
+
+def scaled(path, size):
+    # The image scaled to fit size, as QPixmap(path).scaled(size, Qt.KeepAspectRatio)
+    return _cached(path, 'scaled', size, lambda image: image.scaled(size, Qt.KeepAspectRatio))
+
+
+def cropped(path, size):
+    # The top left size of the image, all that an unscaled brush shows in a window that big
+    return _cached(path, 'cropped', size, lambda image: image.copy(0, 0, size.width(), size.height()))
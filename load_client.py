@@ -0,0 +1,92 @@
+import asyncio
+import json
+import sys
+import time
+
+import game_server
+import hand_table
+
+# Load generator for game_server: opens one connection per table, plays rounds on all
+# of them at once and reports round latency percentiles (bet sent to round settled)
+# for increasing table counts. Without a host it starts a server in this process on
+# a free localhost port.
+#
+#     python load_client.py [rounds per table] [host:port]
+
+TABLE_COUNTS = [10, 100, 1000, 2000]
+
+# Play Q-6-4 or better, like strategy.MinimumHand('Q', '6', '4')
+PLAY_THRESHOLD = 1 << 12 | 12 << 8 | 6 << 4 | 4
+
+
+async def request(reader, writer, message):
+    writer.write(json.dumps(message).encode() + b'\n')
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+async def play_table(host, port, rounds, latencies, ante_bet=10, pair_plus_bet=5):
+    # Play up to rounds rounds on one connection, appending each round's latency
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            dealt = await request(reader, writer, {'action': 'bet', 'ante': ante_bet, 'pair_plus': pair_plus_bet})
+            if not dealt['ok']:
+                break
+            strength = hand_table.strength(*hand_table.encode_hand(dealt['hand']))
+            settled = await request(reader, writer, {'action': 'play' if strength >= PLAY_THRESHOLD else 'fold'})
+            latencies.append(time.perf_counter() - start)
+            if not settled['ok'] or settled['game_over']:
+                break
+    finally:
+        writer.close()
+
+
+def percentile(sorted_values, fraction):
+    # Nearest-rank percentile of an already sorted list
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+async def load_test(host, port, tables, rounds):
+    # Run tables concurrent tables and summarize their round latencies
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(play_table(host, port, rounds, latencies) for _ in range(tables)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'tables': tables,
+        'rounds': len(latencies),
+        'rounds_per_second': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p90_ms': percentile(latencies, 0.90) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'max_ms': latencies[-1] * 1000 if latencies else 0.0,
+    }
+
+
+async def main(rounds, address=None):
+    server = None
+    if address:
+        host, port = address.rsplit(':', 1)
+        port = int(port)
+    else:
+        server = await game_server.start_server(game_server.DEFAULT_HOST, 0)
+        host, port = game_server.DEFAULT_HOST, server.sockets[0].getsockname()[1]
+
+    print(f"{'tables':>8}{'rounds':>10}{'rounds/s':>12}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for tables in TABLE_COUNTS:
+        result = await load_test(host, port, tables, rounds)
+        print(f"{result['tables']:>8}{result['rounds']:>10}{result['rounds_per_second']:>12,.0f}"
+              f"{result['p50_ms']:>10.2f}{result['p90_ms']:>10.2f}{result['p99_ms']:>10.2f}{result['max_ms']:>10.2f}")
+
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20, sys.argv[2] if len(sys.argv) > 2 else None))
@@ -0,0 +1,149 @@
+import bisect
+import cProfile
+import json
+import os
+import threading
+import time
+
+# Opt-in timing of hot methods, for finding out where a real session spends its time.
+#
+# Metrics.instrument replaces chosen methods on one object with timed wrappers, so
+# nothing is measured (and nothing costs anything) unless instrumentation is switched
+# on. Each timed name keeps a call count, the total and maximum time, and a histogram
+# of call times over fixed millisecond buckets, from which percentiles are read.
+# Timers can be updated from several threads (the game window and its worker).
+
+# Upper bounds of the histogram buckets in milliseconds; the last bucket is open
+BUCKETS_MS = [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500]
+
+
+class Timer:
+    __slots__ = ('count', 'total', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def add(self, ms):
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+        self.buckets[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+
+    def percentile(self, fraction):
+        # Upper bound of the bucket holding the given fraction of calls, capped at the slowest call
+        rank = fraction * self.count
+        seen = 0
+        for i, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= rank:
+                return min(BUCKETS_MS[i], self.max) if i < len(BUCKETS_MS) else self.max
+        return 0.0
+
+    def as_dict(self):
+        histogram = {f"<={bound}": count for bound, count in zip(BUCKETS_MS, self.buckets)}
+        histogram[f">{BUCKETS_MS[-1]}"] = self.buckets[-1]
+        return {
+            'count': self.count,
+            'total_ms': self.total,
+            'mean_ms': self.total / self.count if self.count else 0.0,
+            'max_ms': self.max,
+            'p50_ms': self.percentile(0.5),
+            'p90_ms': self.percentile(0.9),
+            'p99_ms': self.percentile(0.99),
+            'histogram': histogram,
+        }
+
+
+class Metrics:
+    def __init__(self):
+        self.timers = {}
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def add(self, name, ms):
+        # Record one call of name taking ms milliseconds
+        with self._lock:
+            timer = self.timers.get(name)
+            if timer is None:
+                timer = self.timers[name] = Timer()
+            timer.add(ms)
+
+    def timed(self, name, func):
+        # Wrap func so every call is recorded under name
+        clock = time.perf_counter
+        add = self.add
+
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                add(name, (clock() - start) * 1000)
+        wrapper.__name__ = getattr(func, '__name__', name)
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    def instrument(self, obj, names, prefix=''):
+        # Time the given methods of obj, recorded as prefix + method name. Must run
+        # before the methods are handed out (e.g. connected to Qt signals).
+        for name in names:
+            setattr(obj, name, self.timed(prefix + name, getattr(obj, name)))
+
+    def snapshot(self):
+        # Every timer as a dict, slowest total first
+        with self._lock:
+            timers = {name: timer.as_dict() for name, timer in self.timers.items()}
+        return dict(sorted(timers.items(), key=lambda item: -item[1]['total_ms']))
+
+    def report(self):
+        # One line per timer, for the overlay
+        lines = [f"{'':<20}{'n':>6}{'mean':>9}{'p90':>9}{'max':>9}"]
+        for name, timer in self.snapshot().items():
+            lines.append(f"{name:<20}{timer['count']:>6}{timer['mean_ms']:>9.2f}{timer['p90_ms']:>9.2f}"
+                         f"{timer['max_ms']:>9.2f}")
+        return "\n".join(lines)
+
+    def dump(self, path):
+        # Write all timers as JSON
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'started': self.started, 'dumped': time.time(), 'timers': self.snapshot()}, f, indent=2)
+
+
+def profile_call(path, func, *args):
+    # Run func under cProfile (the calling thread only) and save the stats to path,
+    # for snakeviz or python -m pstats
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return func(*args)
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+
+
+def start_profile():
+    # A cProfile profiler running on the calling thread, or None when one can't be added
+    # (Python 3.12+ runs one profiler at a time, and that one sees every thread)
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        return None
+    return profiler
+
+
+def stop_profile(profiler, path):
+    # Stop a start_profile profiler, on the thread that started it, and save its stats
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(path)
+
+
+def thread_profile_path(path, name):
+    # Where another thread's profile is saved next to path, e.g. game.worker.prof
+    root, ext = os.path.splitext(path)
+    return f"{root}.{name}{ext}"
@@ -0,0 +1,151 @@
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import hand_table
+import profiles
+import session_stats
+import simulator
+import strategy as strategies
+
+# Multi-core driver for simulator.
+#
+# A run is split into fixed-size shards, each with its own stream spawned from one
+# SeedSequence, whatever the number of workers. Shards return exact integer totals
+# (counts, sums and sums of squares), which are merged in shard order, so a run gives
+# the same numbers on 1 worker or 64. Each shard also returns its
+# session_stats.SessionStats, merged the same way.
+
+SHARD_SIZE = simulator.CHUNK_SIZE
+
+OUTCOMES = ["Dealer Not Qualified", "Player", "Tie", "Dealer", "Fold"]
+# session_stats.RESULTS index of each outcome
+OUTCOME_RESULTS = np.array([session_stats.RESULTS.index(result)
+                            for result in ["Player", "Player", "Tie", "Dealer", "Fold"]])
+
+
+def empty_totals():
+    # Totals of zero rounds
+    return {
+        'rounds': 0,
+        'profit_sum': 0,
+        'profit_sum_sq': 0,
+        'categories': [0] * len(hand_table.CATEGORY_NAMES),
+        'category_profit': [0] * len(hand_table.CATEGORY_NAMES),
+        'outcomes': [0] * len(OUTCOMES),
+        'stats': session_stats.SessionStats(),
+    }
+
+
+def round_outcomes(player_strength, dealer_strength, played, qualify_strength=hand_table.DEALER_QUALIFY_STRENGTH):
+    # OUTCOMES index of each round
+    qualified = dealer_strength >= qualify_strength
+    return np.select(
+        [~played, ~qualified, player_strength > dealer_strength, player_strength == dealer_strength],
+        [4, 0, 1, 2], 3)
+
+
+def shard_totals(rounds_profit, player_strength, dealer_strength, played,
+                 qualify_strength=hand_table.DEALER_QUALIFY_STRENGTH, pair_plus_bet=0, pair_plus_returns=None):
+    # Integer totals and stats of one batch of simulated rounds
+    category = player_strength >> 12
+    outcome = round_outcomes(player_strength, dealer_strength, played, qualify_strength)
+    length = len(hand_table.CATEGORY_NAMES)
+    stats = session_stats.SessionStats()
+    stats.add_batch(OUTCOME_RESULTS[outcome], category, rounds_profit, pair_plus_bet, pair_plus_returns)
+    return {
+        'rounds': len(rounds_profit),
+        'profit_sum': int(rounds_profit.sum()),
+        'profit_sum_sq': int((rounds_profit * rounds_profit).sum()),
+        'categories': np.bincount(category, minlength=length).tolist(),
+        'category_profit': [int(total) for total in np.bincount(category, weights=rounds_profit, minlength=length)],
+        'outcomes': np.bincount(outcome, minlength=len(OUTCOMES)).tolist(),
+        'stats': stats,
+    }
+
+
+def merge(first, second):
+    # Combine the totals of two sets of rounds
+    return {
+        key: [a + b for a, b in zip(first[key], second[key])] if isinstance(first[key], list)
+        else first[key] + second[key]
+        for key in first
+    }
+
+
+def _run_shard(job):
+    # Worker entry point: simulate one shard from its own seed
+    seed_sequence, rounds, ante_bet, pair_plus_bet, play_table, shoe, rules = job
+    rng = np.random.default_rng(seed_sequence)
+    result = simulator.simulate_rounds(rng, rounds, ante_bet, pair_plus_bet, play_table, shoe, rules)
+    pair_plus_payout = simulator.payout_arrays(rules)['pair_plus_payout']
+    # A folded hand gives up its Pair Plus bet, so only played rounds are paid
+    pair_plus_returns = pair_plus_bet * pair_plus_payout[result['player_strength'] >> 12] * result['played']
+    return shard_totals(result['profit'], result['player_strength'], result['dealer_strength'], result['played'],
+                        rules.qualify_strength, pair_plus_bet, pair_plus_returns)
+
+
+def summarize(totals, confidence_z=1.96):
+    # Mean, variance and confidence interval of profit per round
+    rounds = totals['rounds']
+    mean = totals['profit_sum'] / rounds
+    variance = (totals['profit_sum_sq'] - totals['profit_sum'] * totals['profit_sum'] / rounds) / (rounds - 1) \
+        if rounds > 1 else 0.0
+    standard_error = math.sqrt(variance / rounds)
+    return {
+        'rounds': rounds,
+        'mean': mean,
+        'variance': variance,
+        'standard_error': standard_error,
+        'confidence_interval': (mean - confidence_z * standard_error, mean + confidence_z * standard_error),
+        'categories': dict(zip(hand_table.CATEGORY_NAMES[1:], totals['categories'][1:])),
+        'category_profit': dict(zip(hand_table.CATEGORY_NAMES[1:], totals['category_profit'][1:])),
+        'outcomes': dict(zip(OUTCOMES, totals['outcomes'])),
+        'stats': totals['stats'].summary(confidence_z),
+    }
+
+
+def run(rounds, ante_bet=1, pair_plus_bet=0, strategy=None, seed=0, workers=None, shard_size=SHARD_SIZE, shoe=None,
+        rules=None):
+    # Simulate rounds across a process pool and return the merged totals. The strategy
+    # is sent to the workers as its decision table, so callables need not pickle. shoe
+    # is a shoe spec such as 'shoe:6'; each shard starts from a fresh shoe. rules is
+    # anything profiles.get accepts.
+    rules = profiles.get(rules)
+    play_table = strategies.as_strategy(strategy, rules).table()
+    shards = [min(shard_size, rounds - start) for start in range(0, rounds, shard_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(shards))
+    jobs = [(seeds[i], shards[i], ante_bet, pair_plus_bet, play_table, shoe, rules) for i in range(len(shards))]
+
+    workers = workers or os.cpu_count() or 1
+    totals = empty_totals()
+    if workers == 1 or len(jobs) == 1:
+        for job in jobs:
+            totals = merge(totals, _run_shard(job))
+        return totals
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for shard in executor.map(_run_shard, jobs):
+            totals = merge(totals, shard)
+    return totals
+
+
+if __name__ == "__main__":
+    # python parallel_sim.py [rounds] [workers] [seed] [strategy] [shoe]
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    strategy = sys.argv[4] if len(sys.argv) > 4 else None
+    shoe = sys.argv[5] if len(sys.argv) > 5 else None
+    start = time.perf_counter()
+    summary = summarize(run(rounds, strategy=strategy, workers=workers, seed=seed, shoe=shoe))
+    elapsed = time.perf_counter() - start
+    low, high = summary['confidence_interval']
+    print(f"{rounds:,} rounds in {elapsed:.2f}s")
+    print(f"Mean profit per round: {summary['mean']:+.6f} (95% CI {low:+.6f} to {high:+.6f})")
+    print(f"Variance: {summary['variance']:.4f}")
+    for name, count in summary['categories'].items():
+        print(f"  {name:<16}{count / rounds:.6f}")
@@ -0,0 +1,155 @@
+import random
+
+# Qt-free hand evaluation for Three Card Poker. ThreeCardPokerGame delegates
+# to these functions so batch jobs can evaluate hands without a QApplication.
+
+SUITS = ['♥️', '♦️', '♣️', '♠️']
+RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+
+# Mapping of card suits for folders finding
+SUIT_TO_FOLDER = {
+    '♥️': 'hearts',
+    '♦️': 'diamonds',
+    '♣️': 'clubs',
+    '♠️': 'spades'
+}
+
+# Payout for 'Play' bet
+PLAY_PAYOUT = {
+    "High Card": 1,
+    "Pair": 1,
+    "Flush": 1,
+    "Straight": 1,
+    "Three of a Kind": 1,
+    "Straight Flush": 1
+}
+
+# Payout for 'Ante' bet
+ANTE_PAYOUT = {
+    "High Card": 1,
+    "Pair": 1,
+    "Flush": 1,
+    "Straight": 2,
+    "Three of a Kind": 4,
+    "Straight Flush": 5
+}
+
+# Payout for 'Pair Plus' bet
+PAIR_PLUS_PAYOUT = {
+    "High Card": 0,
+    "Pair": 1,
+    "Flush": 4,
+    "Straight": 6,
+    "Three of a Kind": 25,
+    "Straight Flush": 40
+}
+
+# Rank order for cards
+RANK_ORDER = {
+    '2': 2,
+    '3': 3,
+    '4': 4,
+    '5': 5,
+    '6': 6,
+    '7': 7,
+    '8': 8,
+    '9': 9,
+    '10': 10,
+    'J': 11,
+    'Q': 12,
+    'K': 13,
+    'A': 14
+}
+
+# Betting limits of the table, and the balance below which the game is over
+ANTE_LIMITS = (1, 50000)
+PAIR_PLUS_LIMITS = (0, 5000)
+MIN_BALANCE = 10
+
+# Strength of each hand type, weakest first
+HAND_STRENGTHS = {
+    "High Card": 1,
+    "Pair": 2,
+    "Flush": 3,
+    "Straight": 4,
+    "Three of a Kind": 5,
+    "Straight Flush": 6
+}
+
+
+def shuffled_deck():
+    # Create a shuffled deck
+    deck = [{'rank': rank, 'suit': suit} for rank in RANKS for suit in SUITS]
+    random.shuffle(deck)
+    return deck
+
+
+def is_straight(cards):
+    # Check if the hand is a straight
+    rank_values = list(map(lambda card: RANKS.index(card['rank']), cards))
+    rank_values.sort()
+    if rank_values == [0, 1, 12]:  # A-2-3 count as a straight but smallest (not defined in the rules)
+        return True
+    return rank_values[2] - rank_values[0] == 2 and len(set(rank_values)) == 3
+
+
+def is_flush(cards):
+    # Check if the hand is a flush
+    return len(set(card['suit'] for card in cards)) == 1
+
+
+def evaluate_hand(cards):
+    # Evaluate the type of hand
+    if is_straight(cards) and is_flush(cards):
+        return "Straight Flush"
+    if len(set(card['rank'] for card in cards)) == 1:
+        return "Three of a Kind"
+    if is_straight(cards):
+        return "Straight"
+    if is_flush(cards):
+        return "Flush"
+    if len(set(card['rank'] for card in cards)) == 2:
+        return "Pair"
+    return "High Card"
+
+
+def hand_strength(cards):
+    # Determine the strength of the hand
+    return HAND_STRENGTHS.get(evaluate_hand(cards), 0)
+
+
+def compare_hands(player, dealer):
+    # Compare the player's hand to the dealer's hand
+    player_strength = hand_strength(player)
+    dealer_strength = hand_strength(dealer)
+
+    if player_strength > dealer_strength:
+        return "Player"
+    elif player_strength < dealer_strength:
+        return "Dealer"
+    else:
+        player_ranks = sorted([card['rank'] for card in player], key=lambda x: RANK_ORDER[x], reverse=True)
+        dealer_ranks = sorted([card['rank'] for card in dealer], key=lambda x: RANK_ORDER[x], reverse=True)
+
+        if player_strength == 2:  # Pair
+            player_pair_rank = max(player_ranks, key=player_ranks.count)
+            dealer_pair_rank = max(dealer_ranks, key=dealer_ranks.count)
+            if RANK_ORDER[player_pair_rank] > RANK_ORDER[dealer_pair_rank]:
+                return "Player"
+            elif RANK_ORDER[player_pair_rank] < RANK_ORDER[dealer_pair_rank]:
+                return "Dealer"
+            player_non_pair_rank = min(player_ranks, key=player_ranks.count)
+            dealer_non_pair_rank = min(dealer_ranks, key=dealer_ranks.count)
+            if RANK_ORDER[player_non_pair_rank] > RANK_ORDER[dealer_non_pair_rank]:
+                return "Player"
+            elif RANK_ORDER[player_non_pair_rank] < RANK_ORDER[dealer_non_pair_rank]:
+                return "Dealer"
+            return "Tie"
+
+        # High Card, Flush, Straight, Three of a Kind, Straight Flush
+        for p_rank, d_rank in zip(player_ranks, dealer_ranks):
+            if RANK_ORDER[p_rank] > RANK_ORDER[d_rank]:
+                return "Player"
+            elif RANK_ORDER[p_rank] < RANK_ORDER[d_rank]:
+                return "Dealer"
+        return "Tie"
@@ -0,0 +1,178 @@
+import json
+import sys
+
+import hand_table
+import poker_engine
+
+# Rules profiles: the paytables and dealer qualifier of one casino's game.
+#
+# A profile is a JSON-style dict. Any key it leaves out keeps the value of the game's
+# own rules (PROFILES['treasury']):
+#
+#     name              shown in reports
+#     ante_payout       Ante win per unit when the player beats a qualifying dealer
+#     play_payout       Play win per unit in the same case
+#     pair_plus_payout  total paid back per unit of Pair Plus, the bet included,
+#                       like poker_engine.PAIR_PLUS_PAYOUT (so "40 to 1" is 41)
+#     ante_bonus        extra Ante win per unit whenever the hand is played, whatever
+#                       the dealer holds
+#     dealer_qualifies  weakest qualifying dealer hand as ranks, e.g. ["Q"] or ["Q", "6", "4"]
+#
+# Payouts are given per hand type name. get() compiles a profile into a Rules object
+# whose payouts are tuples indexed by hand_table category number, and whose qualifier
+# is a hand_table strength, so settling a round is a few integer lookups. The game
+# settles with Rules.settle and the NumPy simulators index the same tuples as arrays.
+
+PAYTABLES = ['ante_payout', 'play_payout', 'pair_plus_payout', 'ante_bonus']
+
+PROFILES = {
+    'treasury': {
+        'name': "Treasury Brisbane",
+        'ante_payout': poker_engine.ANTE_PAYOUT,
+        'play_payout': poker_engine.PLAY_PAYOUT,
+        'pair_plus_payout': poker_engine.PAIR_PLUS_PAYOUT,
+        'ante_bonus': {name: 0 for name in hand_table.CATEGORY_NAMES[1:]},
+        'dealer_qualifies': ['Q'],
+    },
+    'us_classic': {
+        'name': "Classic US (Pair Plus 40/30/6/3/1, Ante bonus 5/4/1)",
+        'ante_payout': {name: 1 for name in hand_table.CATEGORY_NAMES[1:]},
+        'pair_plus_payout': {"High Card": 0, "Pair": 2, "Flush": 4, "Straight": 7, "Three of a Kind": 31,
+                             "Straight Flush": 41},
+        'ante_bonus': {"High Card": 0, "Pair": 0, "Flush": 0, "Straight": 1, "Three of a Kind": 4,
+                       "Straight Flush": 5},
+    },
+    'jack_qualifier': {
+        'name': "Treasury Brisbane, dealer qualifies with Jack high",
+        'dealer_qualifies': ['J'],
+    },
+}
+
+
+class Rules:
+    __slots__ = ('name', 'ante_payout', 'play_payout', 'pair_plus_payout', 'ante_bonus', 'qualify_strength')
+
+    def __init__(self, name, ante_payout, play_payout, pair_plus_payout, ante_bonus, qualify_strength):
+        self.name = name
+        self.ante_payout = ante_payout
+        self.play_payout = play_payout
+        self.pair_plus_payout = pair_plus_payout
+        self.ante_bonus = ante_bonus
+        self.qualify_strength = qualify_strength
+
+    def dealer_qualifies(self, strength):
+        return strength >= self.qualify_strength
+
+    def settle(self, result, category, dealer_qualified, ante_bet, pair_plus_bet):
+        # Settle a played hand from its comparison with the dealer's ("Player", "Dealer" or
+        # "Tie") and category number. Returns the result, whether the dealer qualified and
+        # the amount paid back on each bet, so the round's profit is ante + pair plus + play
+        # winnings - ante - pair plus - play.
+        if not dealer_qualified:
+            result = "Player"
+
+        pair_plus_winnings = pair_plus_bet * self.pair_plus_payout[category]
+        if result == "Player":
+            ante_winnings = ante_bet * (self.ante_payout[category] + 1) if dealer_qualified else ante_bet * 2
+            play_winnings = ante_bet * (self.play_payout[category] + 1) if dealer_qualified else ante_bet
+        elif result == "Dealer":
+            ante_winnings = 0
+            play_winnings = 0
+        else:
+            ante_winnings = ante_bet
+            play_winnings = 0
+        ante_winnings += ante_bet * self.ante_bonus[category]
+        return result, dealer_qualified, ante_winnings, pair_plus_winnings, play_winnings
+
+    def __repr__(self):
+        return f"<Rules {self.name}>"
+
+
+def compile_profile(profile):
+    # Check a profile and turn it into Rules
+    unknown = set(profile) - set(PAYTABLES) - {'name', 'dealer_qualifies'}
+    if unknown:
+        raise ValueError(f"Unknown rules profile keys: {', '.join(sorted(unknown))}")
+    merged = dict(PROFILES['treasury'], **profile)
+
+    paytables = []
+    for key in PAYTABLES:
+        paytable = merged[key]
+        missing = [name for name in hand_table.CATEGORY_NAMES[1:] if name not in paytable]
+        if missing or set(paytable) - set(hand_table.CATEGORY_NAMES[1:]):
+            raise ValueError(f"{key} needs a payout for exactly these hands: {', '.join(hand_table.CATEGORY_NAMES[1:])}")
+        if any(type(value) is not int or value < 0 for value in paytable.values()):
+            raise ValueError(f"{key} payouts must be whole numbers of at least 0")
+        paytables.append((0,) + tuple(paytable[name] for name in hand_table.CATEGORY_NAMES[1:]))
+
+    ranks = merged['dealer_qualifies']
+    if not 1 <= len(ranks) <= 3 or any(rank not in poker_engine.RANK_ORDER for rank in ranks):
+        raise ValueError(f"dealer_qualifies must be one to three ranks from {', '.join(poker_engine.RANKS)}")
+    values = sorted((poker_engine.RANK_ORDER[rank] for rank in ranks), reverse=True) + [0, 0]
+    qualify_strength = 1 << 12 | values[0] << 8 | values[1] << 4 | values[2]
+
+    return Rules(merged['name'], *paytables, qualify_strength)
+
+
+def load_profile(path):
+    # Read a profile from a JSON file
+    with open(path, encoding='utf-8') as f:
+        profile = json.load(f)
+    profile.setdefault('name', path)
+    return compile_profile(profile)
+
+
+def get(rules=None):
+    # Accept Rules, a profile dict, a name from PROFILES, a JSON file path or None (the game's rules)
+    if rules is None:
+        return DEFAULT
+    if isinstance(rules, Rules):
+        return rules
+    if isinstance(rules, dict):
+        return compile_profile(rules)
+    if rules in PROFILES:
+        return compile_profile(PROFILES[rules])
+    if rules.endswith('.json'):
+        return load_profile(rules)
+    raise ValueError(f"Unknown rules profile {rules!r}, expected one of {', '.join(PROFILES)} or a .json file")
+
+
+DEFAULT = compile_profile(PROFILES['treasury'])
+
+
+def validate(rules, rounds=1_000_000, seed=0):
+    # Exact house edge of a profile, and a simulation with the same compiled payouts
+    # that has to agree with it
+    import house_edge  # needs NumPy, like the simulators
+    import simulator
+    import strategy
+
+    rules = get(rules)
+    exact = house_edge.analyze(rules)
+    optimal = strategy.DecisionTable(exact['play'], name="optimal")
+    ante = simulator.simulate(rounds, 1, 0, optimal, seed=seed, rules=rules)
+    pair_plus = simulator.simulate(rounds, 0, 1, 'always', seed=seed, rules=rules)
+    checks = [(exact['ante_return'], ante), (exact['pair_plus_return'], pair_plus)]
+    return {
+        'rules': rules,
+        'exact': exact,
+        'simulated_ante_return': ante.mean(),
+        'simulated_pair_plus_return': pair_plus.mean(),
+        'consistent': all(abs(profit.mean() - expected) <= 5 * profit.std() / rounds ** 0.5 + 1e-12
+                          for expected, profit in checks),
+    }
+
+
+if __name__ == "__main__":
+    # python profiles.py [profile name or .json path ...] -- validate profiles, all built-in ones by default
+    import profiles  # the module the simulators use, so there is one Rules class
+
+    for rules in sys.argv[1:] or list(PROFILES):
+        result = profiles.validate(rules)
+        exact = result['exact']
+        print(result['rules'].name)
+        print(f"  Ante/Play house edge {exact['ante_edge']:.4%} (simulated {-result['simulated_ante_return']:.4%}), "
+              f"Pair Plus house edge {exact['pair_plus_edge']:.4%} "
+              f"(simulated {-result['simulated_pair_plus_return']:.4%}), "
+              f"plays {exact['play_frequency']:.2%} of hands"
+              + ("" if result['consistent'] else "  ** simulation disagrees **"))
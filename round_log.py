@@ -0,0 +1,62 @@
+import json
+import queue
+import threading
+
+# One JSON record per round, appended to a JSON Lines file by a background thread.
+#
+# log() only puts the record on a queue, so the caller (the GUI thread) never waits
+# on the disk. The writer drains everything queued since its last write, up to
+# batch_size records, and writes and flushes them together. A logger made with
+# path=None is disabled and log() does nothing, for simulation runs.
+
+BATCH_SIZE = 1024
+
+_STOP = object()
+
+
+class RoundLogger:
+    def __init__(self, path, batch_size=BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self.enabled = path is not None
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        if self.enabled:
+            self._thread = threading.Thread(target=self._write_loop, name='RoundLogger', daemon=True)
+            self._thread.start()
+
+    def log(self, record):
+        # Queue a round record (a JSON-serializable dict)
+        if self.enabled:
+            self._queue.put(record)
+
+    def close(self):
+        # Write everything still queued and stop the writer thread
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+        self.enabled = False
+
+    def _write_loop(self):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            stopping = False
+            while not stopping:
+                batch = [self._queue.get()]
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if _STOP in batch:
+                    stopping = True
+                    batch = [record for record in batch if record is not _STOP]
+                f.write(''.join(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+                                for record in batch))
+                f.flush()
+
+
+def read_rounds(path):
+    # Read back the records of a round log
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
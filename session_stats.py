@@ -0,0 +1,196 @@
+import json
+import math
+
+import hand_table
+
+# Running statistics of a playing session, updated in O(1) per round.
+#
+# Nothing per round is kept: SessionStats counts results and player hand types, sums
+# the Pair Plus bets and returns, and follows the profit per round with Welford's
+# running mean and sum of squared deviations (RunningStats). Two sets of stats merge
+# exactly (Chan et al.'s pairwise update), so the stats of simulation shards, server
+# tables or game sessions can be built separately and added together. add_batch takes
+# NumPy arrays of simulated rounds.
+
+# Same order as hand_history.RESULTS
+RESULTS = ["Player", "Dealer", "Tie", "Fold"]
+
+_theoretical = None
+
+
+def theoretical_frequencies():
+    # Chance of each player hand type (indexed like hand_table.CATEGORY_NAMES) from one deck
+    global _theoretical
+    if _theoretical is None:
+        counts = [0] * len(hand_table.CATEGORY_NAMES)
+        for strength in hand_table.STRENGTHS:
+            counts[strength >> 12] += 1
+        _theoretical = [count / hand_table.NUM_HANDS for count in counts]
+    return _theoretical
+
+
+class RunningStats:
+    __slots__ = ('count', 'mean', 'm2')
+
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def add_batch(self, values):
+        # Add a NumPy array of values in one step
+        if len(values):
+            mean = float(values.mean())
+            self.merge(RunningStats(len(values), mean, float(((values - mean) ** 2).sum())))
+
+    def merge(self, other):
+        count = self.count + other.count
+        if count == 0:
+            return
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+
+    @property
+    def variance(self):
+        # Sample variance
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def standard_error(self):
+        return math.sqrt(self.variance / self.count) if self.count else 0.0
+
+
+class SessionStats:
+    __slots__ = ('results', 'categories', 'pair_plus_wagered', 'pair_plus_returned', 'profit')
+
+    def __init__(self):
+        self.results = [0] * len(RESULTS)
+        self.categories = [0] * len(hand_table.CATEGORY_NAMES)
+        self.pair_plus_wagered = 0
+        self.pair_plus_returned = 0
+        self.profit = RunningStats()
+
+    @property
+    def hands(self):
+        return self.profit.count
+
+    def add(self, result, category, profit, pair_plus_bet=0, pair_plus_return=0):
+        # One round: result from RESULTS, the player's hand category number, the round's
+        # profit, and the Pair Plus bet and what it paid back (the bet included)
+        self.results[RESULTS.index(result)] += 1
+        self.categories[category] += 1
+        self.pair_plus_wagered += pair_plus_bet
+        self.pair_plus_returned += pair_plus_return
+        self.profit.add(profit)
+
+    def add_state(self, state):
+        # One settled game_state.RoundState
+        category = hand_table.strength(*hand_table.encode_hand(state.player_hand)) >> 12
+        self.add(state.result, category, state.profited, state.pair_plus_bet, state.winnings[1])
+
+    def add_batch(self, results, categories, profits, pair_plus_bet=0, pair_plus_returns=None):
+        # NumPy arrays of rounds: RESULTS indices, categories and profits, with the same
+        # Pair Plus bet every round and what it paid back
+        import numpy as np
+        for i, count in enumerate(np.bincount(results, minlength=len(RESULTS))):
+            self.results[i] += int(count)
+        for i, count in enumerate(np.bincount(categories, minlength=len(hand_table.CATEGORY_NAMES))):
+            self.categories[i] += int(count)
+        self.pair_plus_wagered += pair_plus_bet * len(profits)
+        if pair_plus_returns is not None:
+            self.pair_plus_returned += int(pair_plus_returns.sum())
+        self.profit.add_batch(profits)
+
+    def merge(self, other):
+        # Add another session's stats to these
+        self.results = [a + b for a, b in zip(self.results, other.results)]
+        self.categories = [a + b for a, b in zip(self.categories, other.categories)]
+        self.pair_plus_wagered += other.pair_plus_wagered
+        self.pair_plus_returned += other.pair_plus_returned
+        self.profit.merge(other.profit)
+        return self
+
+    def copy(self):
+        return SessionStats.from_dict(self.as_dict())
+
+    def __add__(self, other):
+        return self.copy().merge(other)
+
+    def summary(self, confidence_z=1.96):
+        # Rates, hand type frequencies against one deck's odds, Pair Plus return and the
+        # profit per round with its standard error
+        hands = self.hands
+        scale = 1 / hands if hands else 0.0
+        theoretical = theoretical_frequencies()
+        mean = self.profit.mean
+        standard_error = self.profit.standard_error
+        wagered = self.pair_plus_wagered
+        return {
+            'hands': hands,
+            'rates': {result: count * scale for result, count in zip(RESULTS, self.results)},
+            'categories': {name: {'count': self.categories[i], 'frequency': self.categories[i] * scale,
+                                  'theoretical': theoretical[i]}
+                           for i, name in enumerate(hand_table.CATEGORY_NAMES) if name},
+            'pair_plus_wagered': wagered,
+            'pair_plus_returned': self.pair_plus_returned,
+            'pair_plus_roi': (self.pair_plus_returned - wagered) / wagered if wagered else 0.0,
+            'profit_mean': mean,
+            'profit_variance': self.profit.variance,
+            'standard_error': standard_error,
+            'confidence_interval': (mean - confidence_z * standard_error, mean + confidence_z * standard_error),
+        }
+
+    def report(self):
+        # Short text table of summary()
+        summary = self.summary()
+        rates = summary['rates']
+        low, high = summary['confidence_interval']
+        lines = [
+            f"Hands {summary['hands']:,}",
+            f"Win {rates['Player']:.1%}  Lose {rates['Dealer']:.1%}  Tie {rates['Tie']:.1%}  Fold {rates['Fold']:.1%}",
+            f"Profit/hand {summary['profit_mean']:+.2f} (95% {low:+.2f} to {high:+.2f}), sd "
+            f"{math.sqrt(summary['profit_variance']):.2f}",
+            f"Pair Plus ROI {summary['pair_plus_roi']:+.1%} on ${summary['pair_plus_wagered']:,}",
+            f"{'':<16}{'seen':>8}{'odds':>8}",
+        ]
+        for name, category in summary['categories'].items():
+            lines.append(f"{name:<16}{category['frequency']:>8.2%}{category['theoretical']:>8.2%}")
+        return "\n".join(lines)
+
+    def as_dict(self):
+        return {
+            'results': dict(zip(RESULTS, self.results)),
+            'categories': dict(zip(hand_table.CATEGORY_NAMES[1:], self.categories[1:])),
+            'pair_plus_wagered': self.pair_plus_wagered,
+            'pair_plus_returned': self.pair_plus_returned,
+            'profit': {'count': self.profit.count, 'mean': self.profit.mean, 'm2': self.profit.m2},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.results = [data['results'][result] for result in RESULTS]
+        stats.categories = [0] + [data['categories'][name] for name in hand_table.CATEGORY_NAMES[1:]]
+        stats.pair_plus_wagered = data['pair_plus_wagered']
+        stats.pair_plus_returned = data['pair_plus_returned']
+        stats.profit = RunningStats(**data['profit'])
+        return stats
+
+    def dump(self, path):
+        # Write the stats (merge state and summary) as JSON
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'stats': self.as_dict(), 'summary': self.summary()}, f, indent=2)
+
+
+def load(path):
+    # Read stats written by SessionStats.dump
+    with open(path, encoding='utf-8') as f:
+        return SessionStats.from_dict(json.load(f)['stats'])
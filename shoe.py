@@ -0,0 +1,108 @@
+import random
+import sys
+from array import array
+
+import hand_table
+
+# Dealing shoes over a preallocated array of card ints (hand_table encoding).
+#
+# The cards of all decks sit in one array. The undealt cards are the first
+# `remaining` entries, and draw() is a partial Fisher-Yates shuffle: it swaps a
+# uniformly chosen undealt card to the end of that part and shrinks it by one. A
+# round therefore costs its own few swaps. Shuffling only resets `remaining`,
+# because every undealt card is still equally likely to come next whatever order the
+# array is in. Three modes:
+#
+#     single   one deck, reshuffled after every round (the casino rule of the game)
+#     shoe     several decks dealt down to a cut card, then reshuffled
+#     csm      a continuous shuffling machine: the round's cards go back into the
+#              machine after every round, so each round is dealt from all the decks
+#
+# With more than one deck a hand can hold the same card twice; hand_table.strength
+# evaluates those too.
+
+SINGLE_DECK = 'single'
+SHOE = 'shoe'
+CSM = 'csm'
+MODES = [SINGLE_DECK, SHOE, CSM]
+
+# The most cards one round can take: seven seats and the dealer
+MAX_ROUND_CARDS = 24
+
+DEFAULT_PENETRATION = 0.75
+
+
+def cut_card(decks, penetration=DEFAULT_PENETRATION):
+    # Cards dealt from a shoe before it is reshuffled, leaving room for a full round
+    size = decks * hand_table.NUM_CARDS
+    return max(1, min(int(size * penetration), size - MAX_ROUND_CARDS))
+
+
+class Shoe:
+    __slots__ = ('mode', 'decks', 'cut_card', 'cards', 'remaining', 'reshuffles', 'rng')
+
+    def __init__(self, mode=SINGLE_DECK, decks=None, penetration=DEFAULT_PENETRATION, rng=None):
+        if mode not in MODES:
+            raise ValueError(f"Unknown shoe mode {mode!r}, expected one of {', '.join(MODES)}")
+        if decks is None:
+            decks = 1 if mode == SINGLE_DECK else 6
+        if decks < 1 or (mode == SINGLE_DECK and decks != 1):
+            raise ValueError(f"A {mode} shoe can't hold {decks} decks")
+        self.mode = mode
+        self.decks = decks
+        self.cut_card = cut_card(decks, penetration)
+        self.cards = array('B', range(hand_table.NUM_CARDS)) * decks
+        self.remaining = len(self.cards)
+        self.reshuffles = 0
+        self.rng = rng or random.Random()
+
+    @property
+    def dealt(self):
+        return len(self.cards) - self.remaining
+
+    def draw(self, count=3):
+        # Deal count cards as card ints
+        cards = self.cards
+        random_fraction = self.rng.random
+        remaining = self.remaining
+        if count > remaining:
+            raise ValueError("Not enough cards left in the shoe")
+        hand = []
+        for _ in range(count):
+            pick = int(random_fraction() * remaining)
+            remaining -= 1
+            cards[pick], cards[remaining] = cards[remaining], cards[pick]
+            hand.append(cards[remaining])
+        self.remaining = remaining
+        return hand
+
+    def shuffle(self):
+        # Put every card back
+        self.remaining = len(self.cards)
+        self.reshuffles += 1
+
+    def new_round(self):
+        # Get ready for the next round; a shoe is only reshuffled once the cut card is out
+        if self.mode != SHOE or self.dealt >= self.cut_card:
+            self.shuffle()
+
+    def __repr__(self):
+        return f"<Shoe {self.mode} {self.decks} deck(s), {self.remaining} cards left>"
+
+
+def from_spec(spec, rng=None):
+    # Build a shoe from 'single', 'shoe:6', 'shoe:6:0.8' or 'csm:4'
+    mode, _, rest = (spec or SINGLE_DECK).partition(':')
+    decks, _, penetration = rest.partition(':')
+    return Shoe(mode, int(decks) if decks else None,
+                float(penetration) if penetration else DEFAULT_PENETRATION, rng)
+
+
+if __name__ == "__main__":
+    # python shoe.py [spec] [rounds] -- deal rounds of six cards and show the reshuffles
+    shoe = from_spec(sys.argv[1] if len(sys.argv) > 1 else SINGLE_DECK)
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    for _ in range(rounds):
+        shoe.draw(6)
+        shoe.new_round()
+    print(f"{shoe!r}: {rounds:,} rounds, {shoe.reshuffles:,} reshuffles")
@@ -0,0 +1,188 @@
+import sys
+import time
+
+import numpy as np
+
+import hand_table
+import profiles
+import shoe as shoes
+import strategy as strategies
+
+# Vectorized Monte Carlo simulation of whole rounds as integer arrays.
+#
+# Each round deals six cards (player then dealer) with the card encoding of
+# hand_table, looks both hands up in the strength table and settles them with the
+# compiled payouts of a profiles.Rules, or as a fold. Rounds are simulated in chunks so
+# memory stays flat however many rounds are asked for.
+#
+# Cards are dealt the way a shoe.Shoe deals them: a single deck reshuffled every
+# round by default, or a multi-deck shoe or continuous shuffler given as a Shoe or a
+# spec such as 'shoe:6'. Hands with a repeated card (more than one deck only) are a
+# Pair or better and are always played.
+
+CHUNK_SIZE = 1_000_000
+
+STRENGTHS = np.frombuffer(hand_table.STRENGTHS, dtype=np.int32)
+_C2 = np.array([n * (n - 1) // 2 for n in range(hand_table.NUM_CARDS)], dtype=np.int32)
+_C3 = np.array([n * (n - 1) * (n - 2) // 6 for n in range(hand_table.NUM_CARDS)], dtype=np.int32)
+
+
+def payout_arrays(rules):
+    # The compiled paytables of a profiles.Rules as integer arrays indexed by hand category
+    return {key: np.array(getattr(rules, key), dtype=np.int64) for key in profiles.PAYTABLES}
+
+
+def deal(rng, rounds, cards=6, decks=1):
+    # Draw cards cards from a full set of decks for each of rounds rounds, shape (rounds, cards).
+    # The k-th draw picks uniformly among the 52 * decks - k cards left by counting past
+    # the cards already drawn, so no per-round deck is shuffled.
+    dealt = np.empty((rounds, cards), dtype=np.int32)
+    drawn = np.empty((rounds, 0), dtype=np.int32)
+    for k in range(cards):
+        card = rng.integers(0, hand_table.NUM_CARDS * decks - k, size=rounds, dtype=np.int32)
+        for column in range(k):
+            card += card >= drawn[:, column]
+        dealt[:, k] = card
+        drawn = np.sort(dealt[:, :k + 1], axis=1)
+    return dealt if decks == 1 else dealt % hand_table.NUM_CARDS
+
+
+def deal_shoe(rng, rounds, cards, decks, cut_card):
+    # Deal rounds one after another from shuffled multi-deck shoes, starting a new shoe
+    # once cut_card cards are out, like shoe.Shoe in 'shoe' mode
+    size = hand_table.NUM_CARDS * decks
+    rounds_per_shoe = -(-cut_card // cards)
+    shoe_count = -(-rounds // rounds_per_shoe)
+    shuffled = rng.permuted(np.tile(np.arange(size, dtype=np.int32) % hand_table.NUM_CARDS, (shoe_count, 1)), axis=1)
+    return shuffled[:, :rounds_per_shoe * cards].reshape(-1, cards)[:rounds]
+
+
+def deal_rounds(rng, rounds, cards=6, shoe=None):
+    # Deal rounds with the mode of a shoe.Shoe or shoe spec, a single deck if None
+    if shoe is None:
+        return deal(rng, rounds, cards)
+    if isinstance(shoe, str):
+        shoe = shoes.from_spec(shoe)
+    if shoe.mode == shoes.SHOE:
+        return deal_shoe(rng, rounds, cards, shoe.decks, shoe.cut_card)
+    return deal(rng, rounds, cards, shoe.decks)
+
+
+def hand_indices(hands):
+    # hand_table index of each row of a (rounds, 3) card array
+    hands = np.sort(hands, axis=1)
+    return hands[:, 0] + _C2[hands[:, 1]] + _C3[hands[:, 2]]
+
+
+def hand_strengths(hands):
+    # Strength, hand_table index and repeated-card mask of each row of a (rounds, 3)
+    # card array. Hands with a repeated card get index 0 and their own strength.
+    hands = np.sort(hands, axis=1)
+    index = hands[:, 0] + _C2[hands[:, 1]] + _C3[hands[:, 2]]
+    repeated = (hands[:, 0] == hands[:, 1]) | (hands[:, 1] == hands[:, 2])
+    index[repeated] = 0
+    strength = STRENGTHS[index]
+    if repeated.any():
+        # The middle card of a sorted hand is the repeated one
+        pair = hands[repeated, 1]
+        other = np.where(hands[repeated, 0] == pair, hands[repeated, 2], hands[repeated, 0])
+        repeated_strengths = np.frombuffer(hand_table.repeated_strengths(), dtype=np.int32)
+        strength[repeated] = repeated_strengths[pair * hand_table.NUM_CARDS + other]
+    return strength, index, repeated
+
+
+def evaluate(dealt, seats, strategy, multi_deck):
+    # Player strengths and decisions with shape (rounds, seats), and dealer strengths,
+    # for rounds dealt seats hands first and the dealer last
+    rounds = len(dealt)
+    player_cards = dealt[:, :3 * seats].reshape(rounds * seats, 3)
+    if not multi_deck:
+        player_index = hand_indices(player_cards).reshape(rounds, seats)
+        player_strength = STRENGTHS[player_index]
+        return player_strength, strategy.decide(player_index), STRENGTHS[hand_indices(dealt[:, 3 * seats:])]
+    player_strength, player_index, repeated = hand_strengths(player_cards)
+    played = strategy.decide(player_index) | repeated
+    shape = (rounds, seats)
+    return player_strength.reshape(shape), played.reshape(shape), hand_strengths(dealt[:, 3 * seats:])[0]
+
+
+def settle(player_strength, dealer_strength, played, ante_bet, pair_plus_bet, rules=None):
+    # Profit of each round, vectorized version of profiles.Rules.settle plus folding
+    rules = profiles.get(rules)
+    payouts = payout_arrays(rules)
+    category = player_strength >> 12
+    dealer_qualified = dealer_strength >= rules.qualify_strength
+    pair_plus = pair_plus_bet * (payouts['pair_plus_payout'][category] - 1)
+    win = ante_bet * (payouts['ante_payout'] + payouts['play_payout'])[category]
+    bonus = ante_bet * payouts['ante_bonus'][category]
+    ante_play = np.select(
+        [~dealer_qualified, player_strength > dealer_strength, player_strength == dealer_strength],
+        [ante_bet, win, -ante_bet],
+        -2 * ante_bet)
+    return np.where(played, ante_play + bonus + pair_plus, -ante_bet - pair_plus_bet)
+
+
+def is_multi_deck(shoe):
+    return shoe is not None and (shoes.from_spec(shoe) if isinstance(shoe, str) else shoe).decks > 1
+
+
+def simulate_rounds(rng, rounds, ante_bet=1, pair_plus_bet=0, strategy=None, shoe=None, rules=None):
+    # Simulate one batch of rounds; strategy is anything strategy.as_strategy accepts
+    # (None plays every hand) and rules anything profiles.get accepts. Returns a dict
+    # of per-round arrays.
+    dealt = deal_rounds(rng, rounds, 6, shoe)
+    player_strength, played, dealer_strength = evaluate(dealt, 1, strategies.as_strategy(strategy, rules),
+                                                        is_multi_deck(shoe))
+    player_strength = player_strength[:, 0]
+    played = played[:, 0]
+    return {
+        'cards': dealt,
+        'player_strength': player_strength,
+        'dealer_strength': dealer_strength,
+        'played': played,
+        'profit': settle(player_strength, dealer_strength, played, ante_bet, pair_plus_bet, rules),
+    }
+
+
+def simulate_table_rounds(rng, rounds, seats, ante_bet=1, pair_plus_bet=0, strategy=None, shoe=None, rules=None):
+    # Simulate full tables: each round deals every seat and then the dealer from one
+    # shoe, so the seats' cards are removed from what the dealer can get.
+    # Per-seat arrays have shape (rounds, seats).
+    dealt = deal_rounds(rng, rounds, 3 * seats + 3, shoe)
+    player_strength, played, dealer_strength = evaluate(dealt, seats, strategies.as_strategy(strategy, rules),
+                                                        is_multi_deck(shoe))
+    return {
+        'cards': dealt,
+        'player_strength': player_strength,
+        'dealer_strength': dealer_strength,
+        'played': played,
+        'profit': settle(player_strength, dealer_strength[:, None], played, ante_bet, pair_plus_bet, rules),
+    }
+
+
+def simulate(rounds, ante_bet=1, pair_plus_bet=0, strategy=None, seed=None, chunk_size=CHUNK_SIZE, shoe=None,
+             rules=None):
+    # Profit of every round as one int64 array; the same seed gives the same rounds
+    rng = np.random.default_rng(seed)
+    rules = profiles.get(rules)
+    strategy = strategies.as_strategy(strategy, rules)
+    if isinstance(shoe, str):
+        shoe = shoes.from_spec(shoe)
+    profit = np.empty(rounds, dtype=np.int64)
+    for start in range(0, rounds, chunk_size):
+        count = min(chunk_size, rounds - start)
+        profit[start:start + count] = simulate_rounds(rng, count, ante_bet, pair_plus_bet, strategy, shoe, rules)['profit']
+    return profit
+
+
+if __name__ == "__main__":
+    # python simulator.py [rounds] [seed] [strategy] [shoe]
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    strategy = strategies.as_strategy(sys.argv[3] if len(sys.argv) > 3 else None)
+    shoe = sys.argv[4] if len(sys.argv) > 4 else None
+    start = time.perf_counter()
+    profit = simulate(rounds, seed=seed, strategy=strategy, shoe=shoe)
+    elapsed = time.perf_counter() - start
+    print(f"{rounds:,} rounds in {elapsed:.2f}s ({rounds / elapsed * 60:,.0f} rounds/minute)")
+    print(f"Mean profit per unit Ante ({strategy.name}): {profit.mean():+.5f} +/- {profit.std() / np.sqrt(rounds):.5f}")
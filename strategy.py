@@ -0,0 +1,123 @@
+import numpy as np
+
+import hand_table
+import poker_engine
+from house_edge import analyze, hand_cards
+
+# Player play/fold strategies.
+#
+# A strategy only sees the player's own three cards, so every strategy compiles to a
+# boolean decision table over the 22,100 hand indices of hand_table. The simulators
+# index that table with whole arrays of hands, and the GUI looks up a single hand.
+
+STRENGTHS = np.frombuffer(hand_table.STRENGTHS, dtype=np.int32)
+
+
+class Strategy:
+    name = "strategy"
+
+    def __init__(self):
+        self._table = None
+
+    def build_table(self):
+        # Decision for every hand index, overridden by each strategy
+        raise NotImplementedError
+
+    def table(self):
+        # Boolean decision table over all 22,100 hands, built once
+        if self._table is None:
+            table = np.asarray(self.build_table(), dtype=bool)
+            if table.shape != (hand_table.NUM_HANDS,):
+                raise ValueError(f"{self.name}: decision table must have {hand_table.NUM_HANDS} entries")
+            self._table = table
+        return self._table
+
+    def decide(self, hand_indices):
+        # Play (True) or fold (False) for an array of hand indices
+        return self.table()[hand_indices]
+
+    def decide_hand(self, cards):
+        # Play (True) or fold (False) for one hand of card dicts. A hand with a repeated
+        # card (multi-deck shoes only) is a Pair or better and always played.
+        a, b, c = hand_table.encode_hand(cards)
+        if a == b or b == c or a == c:
+            return True
+        return bool(self.table()[hand_table.hand_index(a, b, c)])
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.name}>"
+
+
+class AlwaysPlay(Strategy):
+    name = "always play"
+
+    def build_table(self):
+        return np.ones(hand_table.NUM_HANDS, dtype=bool)
+
+
+class MinimumHand(Strategy):
+    # Play the given high-card hand or better, e.g. MinimumHand('Q', '6', '4')
+
+    def __init__(self, *ranks):
+        super().__init__()
+        values = sorted((poker_engine.RANK_ORDER[rank] for rank in ranks), reverse=True)
+        if len(values) != 3:
+            raise ValueError("MinimumHand needs three ranks")
+        self.threshold = 1 << 12 | values[0] << 8 | values[1] << 4 | values[2]
+        self.name = f"{'-'.join(ranks)} or better"
+
+    def build_table(self):
+        return STRENGTHS >= self.threshold
+
+
+class DecisionTable(Strategy):
+    # A ready-made decision table, e.g. house_edge.analyze()['play']
+
+    def __init__(self, table, name="decision table"):
+        super().__init__()
+        self._source = table
+        self.name = name
+
+    def build_table(self):
+        return self._source
+
+
+class CallableStrategy(Strategy):
+    # Wraps func(strengths, cards) -> bools, called once over all 22,100 hands:
+    # strengths is the hand_table strength of each hand and cards its (22100, 3) card ints
+
+    def __init__(self, func, name=None):
+        super().__init__()
+        self.func = func
+        self.name = name or getattr(func, '__name__', 'callable')
+
+    def build_table(self):
+        return self.func(STRENGTHS, hand_cards())
+
+
+def optimal(**analyze_args):
+    # The strategy with the best exact return, from house_edge.analyze
+    return DecisionTable(analyze(**analyze_args)['play'], name="optimal")
+
+
+# Named strategies, built for a rules profile
+STRATEGIES = {
+    'always': lambda rules: AlwaysPlay(),
+    'q64': lambda rules: MinimumHand('Q', '6', '4'),
+    'optimal': lambda rules: optimal(rules=rules),
+}
+
+
+def as_strategy(strategy, rules=None):
+    # Accept a Strategy, a name from STRATEGIES, a decision table, a callable or None (always play)
+    if strategy is None:
+        return AlwaysPlay()
+    if isinstance(strategy, Strategy):
+        return strategy
+    if isinstance(strategy, str):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy {strategy!r}, expected one of {', '.join(STRATEGIES)}")
+        return STRATEGIES[strategy](rules)
+    if callable(strategy):
+        return CallableStrategy(strategy)
+    return DecisionTable(strategy)
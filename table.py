@@ -0,0 +1,119 @@
+import hand_table
+import profiles
+import shoe as shoes
+
+# A Three Card Poker table: up to seven seats dealt from one shoe.Shoe (a single deck
+# reshuffled every round by default) against a single dealer hand. The dealer hand is
+# evaluated once per round and every seat that played is settled against it in the
+# same pass, with the compiled payouts of a profiles.Rules. game_state.GameStateMachine
+# runs a one-seat table.
+
+MAX_SEATS = 7
+
+
+class Seat:
+    __slots__ = ('balance', 'hand', 'ante_bet', 'pair_plus_bet', 'play_bet', 'profited', 'result',
+                 'dealer_qualified', 'winnings')
+
+    def __init__(self, balance):
+        self.balance = balance
+        self.hand = []
+        self.ante_bet = 0
+        self.pair_plus_bet = 0
+        self.play_bet = 0
+        self.profited = 0
+        self.result = ""
+        self.dealer_qualified = False
+        self.winnings = (0, 0, 0)
+
+
+class Table:
+    __slots__ = ('seats', 'dealer_hand', 'shoe', 'rules')
+
+    def __init__(self, seats=1, balance=1000, rules=None, shoe=None):
+        if not 1 <= seats <= MAX_SEATS:
+            raise ValueError(f"A table has 1 to {MAX_SEATS} seats")
+        self.seats = [Seat(balance) for _ in range(seats)]
+        self.dealer_hand = []
+        self.shoe = shoe or shoes.Shoe()
+        self.rules = profiles.get(rules)
+
+    def draw_cards(self):
+        # Draw three cards from the shoe, highest rank first
+        return [hand_table.int_to_card(card) for card in sorted(self.shoe.draw(3), reverse=True)]
+
+    def place_bet(self, seat, ante_bet, pair_plus_bet):
+        # Take a seat's Ante and Pair Plus bets for the next round
+        if ante_bet + pair_plus_bet > seat.balance:
+            raise ValueError("You don't have enough balance for this bet!")
+        seat.ante_bet = ante_bet
+        seat.pair_plus_bet = pair_plus_bet
+        seat.play_bet = 0
+        seat.profited = - ante_bet - pair_plus_bet
+        seat.hand = []
+        seat.result = ""
+        seat.dealer_qualified = False
+        seat.winnings = (0, 0, 0)
+
+    def deal(self):
+        # Deal every seat with an Ante bet, in seat order
+        self.dealer_hand = []
+        for seat in self.seats:
+            if seat.ante_bet:
+                seat.hand = self.draw_cards()
+
+    def _expect_decision(self, seat):
+        # A seat decides once, after its hand is dealt
+        if not seat.hand:
+            raise ValueError("Place a bet first!")
+        if seat.play_bet or seat.result:
+            raise ValueError("This hand has already been played or folded!")
+
+    def play(self, seat):
+        # Seat places a Play bet equal to its Ante
+        self._expect_decision(seat)
+        if seat.ante_bet > seat.balance:
+            raise ValueError("You don't have enough balance for this bet!")
+        seat.play_bet = seat.ante_bet
+        seat.profited -= seat.play_bet
+
+    def fold(self, seat):
+        # Seat gives up its Ante and Pair Plus bets
+        self._expect_decision(seat)
+        seat.result = "Fold"
+        seat.dealer_qualified = False
+        seat.winnings = (0, 0, 0)
+        seat.balance += seat.profited
+
+    def settle(self):
+        # Reveal the dealer hand and settle every seat that played against it. A seat
+        # that was dealt a hand but neither played nor folded folds.
+        for seat in self.seats:
+            if seat.hand and not seat.play_bet and not seat.result:
+                self.fold(seat)
+        self.dealer_hand = self.draw_cards()
+        dealer_strength = hand_table.strength(*hand_table.encode_hand(self.dealer_hand))
+        dealer_qualified = self.rules.dealer_qualifies(dealer_strength)
+        for seat in self.seats:
+            if not seat.play_bet:
+                continue
+            player_strength = hand_table.strength(*hand_table.encode_hand(seat.hand))
+            if player_strength > dealer_strength:
+                result = "Player"
+            elif player_strength < dealer_strength:
+                result = "Dealer"
+            else:
+                result = "Tie"
+            seat.result, seat.dealer_qualified, ante_winnings, pair_plus_winnings, play_winnings = \
+                self.rules.settle(result, player_strength >> 12, dealer_qualified, seat.ante_bet, seat.pair_plus_bet)
+            seat.winnings = (ante_winnings, pair_plus_winnings, play_winnings)
+            seat.profited += ante_winnings + pair_plus_winnings + play_winnings
+            seat.balance += seat.profited
+
+    def finish_round(self):
+        # Clear the bets and get the shoe ready for the next round
+        for seat in self.seats:
+            seat.ante_bet = 0
+            seat.pair_plus_bet = 0
+            seat.play_bet = 0
+        self.shoe.new_round()